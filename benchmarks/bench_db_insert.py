@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+# Benchmark for writing scraped docket cases to sqlite: the original one insert_case_with_details call per
+# case against insert_cases_bulk, on fresh throwaway databases built with tools/create_schema.py. Reports
+# rows/sec (cases plus their case number, judge, litigant and attorney rows) and checks both paths wrote
+# the same rows.
+#
+#   python benchmarks/bench_db_insert.py
+#   python benchmarks/bench_db_insert.py --cases 20000 --batch 300    # roughly a month of dockets per batch
+
+import argparse
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+
+from db_ops import insert_case_with_details, insert_cases_bulk  # noqa: E402
+from get_argument_dates import CaseData  # noqa: E402
+
+TABLES = ("cases", "case_numbers", "people", "case_judges", "case_litigants", "case_attorneys")
+# Compared by name through the views; person ids depend on the order names were first seen
+NAME_VIEWS = ("judges", "litigants", "attorneys")
+
+def create_db(work_dir: str, name: str) -> str:
+    # create_schema.py writes ../data/cases.db relative to where it runs
+    run_dir = os.path.join(work_dir, name, "run")
+    os.makedirs(run_dir)
+    os.makedirs(os.path.join(work_dir, name, "data"))
+    script = os.path.join(BENCH_DIR, "..", "tools", "create_schema.py")
+    subprocess.run([sys.executable, script], cwd=run_dir, check=True, stdout=subprocess.DEVNULL)
+    return os.path.join(work_dir, name, "data", "cases.db")
+
+def make_cases(count: int, seed: int = 1) -> list[CaseData]:
+    """Synthetic cases shaped like real docket entries."""
+    rng = random.Random(seed)
+    judges = [f"Judge {n}" for n in range(30)]
+    cases = []
+    for i in range(count):
+        numbers = [(f"{800000 + i}", True)]
+        if rng.random() < 0.1:
+            numbers.append((f"{900000 + i}", False))
+        cases.append(CaseData(
+            case_numbers=numbers,
+            case_title=f"State of Washington, Respondent v. Person {i}, Appellant",
+            argument_date=f"2020-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            panel=rng.sample(judges, 3),
+            oral_argument=rng.random() < 0.3,
+            litigants=[(f"State of Washington {i}", "Respondent"), (f"Person {i}", "Appellant")],
+            attorneys=[f"Attorney {rng.randint(0, 2000)}" for _ in range(rng.randint(1, 4))],
+            lower_court="King County Superior Court",
+            lower_court_case_number=f"20-1-{i:05d}-1"
+        ))
+    return cases
+
+def insert_one_by_one(conn: sqlite3.Connection, batch: list[CaseData]) -> None:
+    for case in batch:
+        insert_case_with_details(
+            conn=conn,
+            division="1",
+            case_numbers=case.case_numbers,
+            case_title=case.case_title,
+            panel_date=case.argument_date,
+            oral_arguments=case.oral_argument,
+            judges=case.panel,
+            litigants=case.litigants,
+            attorneys=case.attorneys,
+            lower_court=case.lower_court,
+            lower_court_case_number=case.lower_court_case_number
+        )
+
+def insert_bulk(conn: sqlite3.Connection, batch: list[CaseData]) -> None:
+    insert_cases_bulk(conn, "1", batch)
+
+def run(label: str, insert, db_path: str, cases: list[CaseData], batch_size: int) -> list:
+    conn = sqlite3.connect(db_path)
+    # The scrapers' connection turns this on once when it's opened (db_ops.open_connection)
+    conn.execute("PRAGMA foreign_keys = ON;")
+    start = time.perf_counter()
+    for i in range(0, len(cases), batch_size):
+        with conn:  # one transaction per batch
+            insert(conn, cases[i:i + batch_size])
+    elapsed = time.perf_counter() - start
+
+    rows = sum(conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in TABLES)
+    print(f"  {label:<14} {rows:>9} rows {elapsed:>8.2f} s {rows / elapsed:>12.0f} rows/s")
+    # Everything but scraped_at, for comparing the two paths
+    snapshot = [
+        conn.execute(
+            "SELECT id, division, case_title, panel_date, oral_arguments, opinion_date, "
+            "opinion_publication_status, disposition_status, lower_court, lower_court_case_number, "
+            "court_level FROM cases ORDER BY id"
+        ).fetchall(),
+        conn.execute("SELECT * FROM case_numbers ORDER BY id").fetchall(),
+    ]
+    snapshot += [sorted(conn.execute(f"SELECT * FROM {view}").fetchall()) for view in NAME_VIEWS]
+    conn.close()
+    return snapshot
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark per-case against bulk case inserts.")
+    parser.add_argument("--cases", type=int, default=5000, help="Number of synthetic cases (default 5000)")
+    parser.add_argument("--batch", type=int, default=15, help="Cases per transaction (default 15, about a docket day)")
+    args = parser.parse_args()
+
+    cases = make_cases(args.cases)
+    with tempfile.TemporaryDirectory() as work_dir:
+        print(f"{args.cases} cases in batches of {args.batch}")
+        before = run("one by one", insert_one_by_one, create_db(work_dir, "before"), cases, args.batch)
+        after = run("bulk", insert_bulk, create_db(work_dir, "after"), cases, args.batch)
+
+    if before != after:
+        print("❌ The two paths wrote different rows")
+        sys.exit(1)
+    print("✅ Both paths wrote the same rows")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+
+# Offline benchmark for the page parsers, run against the saved pages in benchmarks/fixtures/. No network
+# and (unless --webdriver is given) no browser.
+#
+# For each parsing backend it reports pages/sec, cases (or opinions)/sec and peak memory, and it checks the
+# parsed output against benchmarks/fixtures/expected.json so a parser change that alters results gets caught
+# here instead of half way through a multi-hour backfill.
+#
+#   python benchmarks/bench_parsers.py
+#   python benchmarks/bench_parsers.py --iterations 500
+#   python benchmarks/bench_parsers.py --webdriver        # also time the WebDriver walks and the in-browser
+#                                                         # script extraction (needs cft/ Chrome)
+#   python benchmarks/bench_parsers.py --update-expected  # after an intended change in parser output
+#
+# Fixtures:
+#   docket_*.html      docket pages. Between them they cover the 7 layout patterns listed in the
+#                      process_page docstring, loose (unclosed) markup and a page without a docket.
+#   docket_index_*     a docket folder/year index page
+#   opinions_*.html    opinions search result pages
+
+import argparse
+from dataclasses import asdict
+import glob
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+EXPECTED_PATH = os.path.join(FIXTURE_DIR, "expected.json")
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+
+from get_argument_dates import parse_docket  # noqa: E402
+from get_opinions import get_opinions_from_driver, get_opinions_from_html, get_opinions_from_script  # noqa: E402
+from page_parser import parse_docket_index, parse_strong_elements  # noqa: E402
+
+def load_fixtures(prefix: str) -> dict[str, str]:
+    fixtures = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, f"{prefix}*.html"))):
+        with open(path, encoding="utf-8") as f:
+            fixtures[os.path.basename(path)] = f.read()
+    return fixtures
+
+def as_json(value):
+    # Round-trip through json so tuples and lists compare equal to what's stored in expected.json
+    return json.loads(json.dumps(value))
+
+# Each parser takes (fixture name, html) and returns (json-able result, number of records parsed)
+
+def docket_page_source(name: str, html: str):
+    argument_date, cases = parse_docket(parse_strong_elements(html))
+    return {"argument_date": argument_date, "cases": [asdict(c) for c in cases]}, len(cases)
+
+def opinions_html(name: str, html: str):
+    opinions = get_opinions_from_html(html, "", "")
+    return [asdict(o) for o in opinions], len(opinions)
+
+def index_html(name: str, html: str):
+    folder = name.split("_")[2]
+    files = sorted(parse_docket_index(html, folder))
+    return files, len(files)
+
+def webdriver_parsers(driver):
+    """The WebDriver walks, fed by loading each fixture in Chrome from disk."""
+    from selenium.webdriver.common.by import By
+
+    def load(name: str) -> None:
+        driver.get("file://" + os.path.join(FIXTURE_DIR, name))
+
+    def docket_webdriver(name: str, html: str):
+        load(name)
+        argument_date, cases = parse_docket(driver.find_elements(By.TAG_NAME, "strong"))
+        return {"argument_date": argument_date, "cases": [asdict(c) for c in cases]}, len(cases)
+
+    def opinions_webdriver(name: str, html: str):
+        load(name)
+        opinions = get_opinions_from_driver(driver, "", "")
+        return [asdict(o) for o in opinions], len(opinions)
+
+    def opinions_script(name: str, html: str):
+        load(name)
+        opinions = get_opinions_from_script(driver, "", "")
+        return [asdict(o) for o in opinions], len(opinions)
+
+    return docket_webdriver, opinions_webdriver, opinions_script
+
+def run(label: str, parse, fixtures: dict[str, str], iterations: int, expected: dict, results: dict) -> bool:
+    """Time one backend over a set of fixtures. Returns False if any output differs from expected."""
+    ok = True
+    for name, html in fixtures.items():
+        output, _ = parse(name, html)
+        results[name] = as_json(output)
+        if name in expected and expected[name] != results[name]:
+            print(f"  ❌ {label}: output for {name} differs from expected.json")
+            ok = False
+
+    pages = 0
+    records = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for name, html in fixtures.items():
+            _, count = parse(name, html)
+            pages += 1
+            records += count
+    elapsed = time.perf_counter() - start
+
+    # Memory is measured on a separate pass; tracing allocations would skew the timing above
+    tracemalloc.start()
+    for name, html in fixtures.items():
+        parse(name, html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"  {label:<28} {pages / elapsed:>10.1f} pages/s {records / elapsed:>12.1f} records/s "
+        f"{peak / 1024:>10.1f} KiB peak"
+    )
+    return ok
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the page parsers against saved fixtures.")
+    parser.add_argument("--iterations", type=int, default=200, help="Passes over the fixtures per backend (default 200)")
+    parser.add_argument("--webdriver", action="store_true", help="Also benchmark the WebDriver walks in headless Chrome")
+    parser.add_argument("--update-expected", action="store_true", help="Rewrite expected.json from the page-source parsers")
+    args = parser.parse_args()
+
+    expected = {}
+    if os.path.exists(EXPECTED_PATH) and not args.update_expected:
+        with open(EXPECTED_PATH, encoding="utf-8") as f:
+            expected = json.load(f)
+
+    dockets = {k: v for k, v in load_fixtures("docket_").items() if not k.startswith("docket_index_")}
+    indexes = load_fixtures("docket_index_")
+    opinions = load_fixtures("opinions_")
+
+    results: dict = {}
+    ok = True
+    print(f"{args.iterations} iterations over {len(dockets)} docket, {len(indexes)} index and {len(opinions)} opinions pages")
+    ok &= run("docket page-source", docket_page_source, dockets, args.iterations, expected, results)
+    ok &= run("docket index", index_html, indexes, args.iterations, expected, results)
+    ok &= run("opinions html", opinions_html, opinions, args.iterations, expected, results)
+
+    if args.webdriver:
+        from driver_factory import create_driver
+        driver = create_driver()
+        try:
+            docket_webdriver, opinions_webdriver, opinions_script = webdriver_parsers(driver)
+            # Far slower; a handful of passes is plenty. Peak memory is the python side only.
+            iterations = max(1, args.iterations // 100)
+            ok &= run("docket webdriver", docket_webdriver, dockets, iterations, expected, {})
+            ok &= run("opinions webdriver", opinions_webdriver, opinions, iterations, expected, {})
+            ok &= run("opinions script", opinions_script, opinions, iterations, expected, {})
+        finally:
+            driver.quit()
+
+    if args.update_expected:
+        with open(EXPECTED_PATH, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True, ensure_ascii=False)
+            f.write("\n")
+        print(f"✅ Wrote {EXPECTED_PATH}")
+    elif not ok:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,40 @@
 import argparse
 import sqlite3
 import csv
+import gzip
+import json
 import os
+import pathlib
+import re
+import sys
+import time
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "cases.db")
+METADATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "metadata.json")
 
 def get_connection():
     return sqlite3.connect(DB_PATH)
 
+ATTORNEY_CASES_SQL = """
+    SELECT
+        c.case_title,
+        c.panel_date,
+        c.division,
+        p.name AS attorney_name,
+        cn.case_number,
+        cn.is_primary
+    FROM people p
+    JOIN case_attorneys a ON a.person_id = p.id
+    JOIN cases c ON c.id = a.case_id
+    JOIN case_numbers cn ON c.id = cn.case_id
+    WHERE p.name_key LIKE '%' || LOWER(:pattern) || '%'
+    ORDER BY c.panel_date;
+"""
+
 def query_cases_for_attorney(pattern: str):
     conn = get_connection()
     cur = conn.cursor()
-    cur.execute("""
-        SELECT 
-            c.case_title,
-            c.panel_date,
-            c.division,
-            a.name AS attorney_name,
-            cn.case_number,
-            cn.is_primary
-        FROM cases c
-        JOIN attorneys a ON c.id = a.case_id
-        JOIN case_numbers cn ON c.id = cn.case_id
-        WHERE LOWER(a.name) LIKE LOWER(?)
-        ORDER BY c.panel_date;
-    """, (f"%{pattern}%",))
+    cur.execute(ATTORNEY_CASES_SQL, {"pattern": pattern})
     rows = cur.fetchall()
     conn.close()
     return rows
@@ -34,8 +44,8 @@ def query_unique_attorneys():
     cur = conn.cursor()
     cur.execute("""
         SELECT name
-        FROM attorneys
-        GROUP BY LOWER(name)
+        FROM people
+        WHERE id IN (SELECT person_id FROM case_attorneys)
         ORDER BY name;
     """)
     names = [row[0] for row in cur.fetchall()]
@@ -47,14 +57,309 @@ def query_unique_judges():
     cur = conn.cursor()
     cur.execute("""
         SELECT name
-        FROM judges
-        GROUP BY LOWER(name)
+        FROM people
+        WHERE id IN (SELECT person_id FROM case_judges)
         ORDER BY name;
     """)
     names = [row[0] for row in cur.fetchall()]
     conn.close()
     return names
 
+def fts_query(text: str) -> str:
+    """
+        Turns plain words into an FTS5 query: every word must match, as a prefix ("smi" finds Smith).
+        Quoting each word keeps punctuation in names (O'Brien, Smith-Jones) from being read as FTS syntax.
+    """
+    words = re.findall(r"\w+", text)
+    return " ".join(f'"{w}"*' for w in words)
+
+def search_cases(text: str, column: str | None = None, limit: int = 50, raw: bool = False):
+    """
+        Full-text search over case titles, litigant and attorney names (the case_search index), best
+        matches first. column limits the search to case_title, litigants or attorneys. With raw, text is
+        passed through as an FTS5 query.
+    """
+    query = text if raw else fts_query(text)
+    if column:
+        query = f"{column} : ({query})"
+    conn = get_connection()
+    try:
+        return conn.execute("""
+            SELECT
+                cn.case_number,
+                c.case_title,
+                c.panel_date,
+                c.opinion_date,
+                c.division,
+                highlight(case_search, 1, '[', ']') AS litigants,
+                highlight(case_search, 2, '[', ']') AS attorneys
+            FROM case_search
+            JOIN cases c ON c.id = case_search.rowid
+            LEFT JOIN case_numbers cn ON cn.case_id = c.id AND cn.is_primary = 1
+            WHERE case_search MATCH ?
+            ORDER BY bm25(case_search)
+            LIMIT ?;
+        """, (query, limit)).fetchall()
+    finally:
+        conn.close()
+
+DURATION_DIMENSIONS = ["all", "division", "month", "judge", "publication_status"]
+
+def query_case_durations(dimension: str):
+    """
+        Days from panel date to opinion for each grouping of a dimension (division, month considered,
+        judge, publication status, or all cases): decided cases, median, p90 and p99, and how many are still
+        waiting for an opinion. Read from the histogram tables the scrapers keep up to date.
+    """
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("""
+        WITH buckets AS (
+            SELECT dimension, label, days, cases, 0 AS pending
+            FROM case_duration_histogram WHERE dimension = :dimension
+            UNION ALL
+            SELECT dimension, label, NULL, 0, cases
+            FROM case_duration_backlog WHERE dimension = :dimension
+        ),
+        running AS (
+            SELECT
+                label, days, pending,
+                SUM(cases) OVER (PARTITION BY label ORDER BY days ROWS UNBOUNDED PRECEDING) AS cumulative,
+                SUM(cases) OVER (PARTITION BY label) AS decided
+            FROM buckets
+        )
+        SELECT
+            label,
+            MAX(decided) AS decided,
+            MIN(CASE WHEN days IS NOT NULL AND cumulative >= 0.50 * decided THEN days END) AS median_days,
+            MIN(CASE WHEN days IS NOT NULL AND cumulative >= 0.90 * decided THEN days END) AS p90_days,
+            MIN(CASE WHEN days IS NOT NULL AND cumulative >= 0.99 * decided THEN days END) AS p99_days,
+            SUM(pending) AS pending
+        FROM running
+        GROUP BY label
+        ORDER BY label;
+    """, {"dimension": dimension})
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+# stats reads the case columns straight from the cursor into NumPy arrays and does all the grouping and
+# percentile work there, instead of building Python lists of every row. Dates come out of SQLite as days
+# since 1970-01-01 so NumPy never parses a string; NO_DATE stands in for a missing or unparsable date.
+STATS_DIMENSIONS = ["division", "publication_status", "oral_arguments", "year"]
+STATS_PERCENTILES = (0.50, 0.90, 0.99)
+NO_DATE = -(2 ** 31)
+CASE_COLUMNS_SQL = f"""
+    SELECT
+        division,
+        IFNULL(CAST(julianday(panel_date) - 2440587.5 AS INTEGER), {NO_DATE}) AS panel_day,
+        IFNULL(CAST(julianday(opinion_date) - 2440587.5 AS INTEGER), {NO_DATE}) AS opinion_day,
+        IFNULL(oral_arguments, 0) AS oral_arguments,
+        IFNULL(NULLIF(opinion_publication_status, ''), 'unknown') AS publication_status
+    FROM cases;
+"""
+
+def load_case_columns(chunk_size: int = 50_000):
+    """
+        The columns stats works on, as a NumPy structured array (one field per column). Rows are streamed
+        from the cursor chunk by chunk, so memory is the size of the arrays, not of a list of row tuples.
+    """
+    import numpy as np  # only stats needs NumPy; keep the other subcommands working without it
+
+    dtype = np.dtype([
+        ("division", "U8"),
+        ("panel_day", "i4"),
+        ("opinion_day", "i4"),
+        ("oral_arguments", "i1"),
+        ("publication_status", "U32"),
+    ])
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(CASE_COLUMNS_SQL)
+    chunks = []
+    while rows := cur.fetchmany(chunk_size):
+        chunks.append(np.array(rows, dtype=dtype))
+    conn.close()
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=dtype)
+
+def grouped_distribution(groups, days, percentiles=STATS_PERCENTILES):
+    """
+        Count, mean and nearest-rank percentiles of days for each distinct value of groups, without a
+        Python loop over the rows: sort by (group, days) once, then pick each percentile out of each
+        group's sorted run by index.
+
+        Output: (group labels, counts, means, {percentile: values})
+    """
+    import numpy as np
+
+    order = np.lexsort((days, groups))
+    groups, days = groups[order], days[order]
+    labels, starts, counts = np.unique(groups, return_index=True, return_counts=True)
+    means = np.add.reduceat(days, starts) / counts if len(days) else np.zeros(0)
+    values = {
+        q: days[starts + np.maximum(np.ceil(q * counts).astype(np.int64) - 1, 0)]
+        for q in percentiles
+    }
+    return labels, counts, means, values
+
+def case_stats(dimension: str, bin_days: int = 30):
+    """
+        Days from panel date to opinion across all cases, vectorized with NumPy:
+        - the distribution (count, mean, median, p90, p99) per dimension value, plus how many are pending
+        - a histogram of days to opinion in bins of bin_days
+        - year over year: decided cases and median days by the year the opinion came out, with the change
+          from the year before
+
+        Output: (groups rows, histogram rows, trend rows), ready to print or export
+    """
+    import numpy as np
+
+    cases = load_case_columns()
+    has_panel = cases["panel_day"] != NO_DATE
+    decided = has_panel & (cases["opinion_day"] != NO_DATE) & (cases["opinion_day"] >= cases["panel_day"])
+    pending = has_panel & (cases["opinion_day"] == NO_DATE)
+    days = (cases["opinion_day"] - cases["panel_day"]).astype(np.int64)
+
+    def years(day_numbers):
+        return day_numbers.astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64) + 1970
+
+    if dimension == "year":
+        # The year the case was considered (only looked at for cases that have a panel date)
+        keys = years(np.where(has_panel, cases["panel_day"], 0)).astype(str)
+    else:
+        keys = cases[dimension].astype(str)
+
+    labels, counts, means, values = grouped_distribution(keys[decided], days[decided])
+    pending_labels, pending_counts = np.unique(keys[pending], return_counts=True)
+    pending_by_label = dict(zip(pending_labels.tolist(), pending_counts.tolist()))
+    groups = [
+        (label, int(count), round(float(mean), 1), *(int(values[q][i]) for q in STATS_PERCENTILES),
+         pending_by_label.pop(label, 0))
+        for i, (label, count, mean) in enumerate(zip(labels.tolist(), counts, means))
+    ]
+    # Groupings with nothing decided yet
+    groups += [(label, 0, None, None, None, None, count) for label, count in pending_by_label.items()]
+    groups.sort(key=lambda row: row[0])
+
+    histogram = []
+    if decided.any():
+        top = int(days[decided].max())
+        edges = np.arange(0, top + bin_days + 1, bin_days)
+        hist, edges = np.histogram(days[decided], bins=edges)
+        histogram = [(int(lo), int(hi) - 1, int(n)) for lo, hi, n in zip(edges[:-1], edges[1:], hist)]
+
+    trend = []
+    opinion_years = years(cases["opinion_day"][decided])
+    year_labels, year_counts, _, year_values = grouped_distribution(opinion_years, days[decided], (0.50,))
+    previous = None
+    for year, count, median in zip(year_labels.tolist(), year_counts.tolist(), year_values[0.50].tolist()):
+        change = round(100.0 * (median - previous) / previous, 1) if previous else None
+        trend.append((year, count, median, change))
+        previous = median
+
+    return groups, histogram, trend
+
+# export streams a query's rows from the cursor to a file in chunks of EXPORT_CHUNK_ROWS, so memory stays
+# flat however many rows the query returns
+EXPORT_FORMATS = ["csv", "jsonl"]
+EXPORT_CHUNK_ROWS = 5000
+EXPORT_PROGRESS_SECONDS = 2.0
+
+def canned_queries() -> dict[str, str]:
+    """Queries export can run by name: attorney-cases plus the datasette canned queries in metadata.json."""
+    queries = {"attorney-cases": ATTORNEY_CASES_SQL}
+    with open(METADATA_PATH, encoding="utf-8") as f:
+        metadata = json.load(f)
+    for database in metadata.get("databases", {}).values():
+        for name, query in database.get("queries", {}).items():
+            queries[name] = query["sql"]
+    return queries
+
+def query_params(sql: str) -> list[str]:
+    """The :name parameters a query expects, in order of first use."""
+    # Skip string literals, e.g. the ':' in 'attorneys : "...'
+    unquoted = re.sub(r"'(?:[^']|'')*'", "''", sql)
+    return list(dict.fromkeys(re.findall(r"(?<!:):([A-Za-z_]\w*)", unquoted)))
+
+def export_format(output: str, fmt: str | None, compress: bool) -> tuple[str, bool]:
+    """Format and compression for output: as given, otherwise from the file name (e.g. cases.jsonl.gz)."""
+    name = output.lower()
+    if name.endswith(".gz"):
+        compress = True
+        name = name[:-3]
+    if fmt is None:
+        fmt = "jsonl" if name.endswith((".jsonl", ".ndjson")) else "csv"
+    return fmt, compress
+
+def export_query(
+    sql: str,
+    params: dict[str, str],
+    output: str,
+    fmt: str = "csv",
+    compress: bool = False,
+    chunk_rows: int = EXPORT_CHUNK_ROWS
+) -> int:
+    """
+        Runs sql (read-only) and streams its rows to output ("-" for stdout) as CSV with a header row or as
+        JSON Lines (one object per row), gzip-compressed if asked. Reports progress on stderr.
+
+        Output: the number of rows written
+    """
+    # Read-only, so raw SQL can't change the database by accident
+    conn = sqlite3.connect(f"{pathlib.Path(DB_PATH).resolve().as_uri()}?mode=ro", uri=True)
+    cur = conn.cursor()
+    cur.arraysize = chunk_rows
+    cur.execute(sql, params)
+    columns = [d[0] for d in cur.description]
+
+    if output == "-":
+        f = gzip.open(sys.stdout.buffer, "wt", encoding="utf-8", newline="") if compress else sys.stdout
+    elif compress:
+        f = gzip.open(output, "wt", encoding="utf-8", newline="")
+    else:
+        f = open(output, "w", encoding="utf-8", newline="")
+
+    start = last_report = time.perf_counter()
+    count = 0
+    try:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(columns)
+        while rows := cur.fetchmany():
+            if fmt == "csv":
+                writer.writerows(rows)
+            else:
+                f.writelines(
+                    json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str) + "\n" for row in rows
+                )
+            count += len(rows)
+            now = time.perf_counter()
+            if now - last_report >= EXPORT_PROGRESS_SECONDS:
+                print(f"ℹ️ {count} rows ({count / (now - start):.0f} rows/s)", file=sys.stderr)
+                last_report = now
+    finally:
+        if f is not sys.stdout:
+            f.close()
+        conn.close()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"✅ Exported {count} rows to {'stdout' if output == '-' else output} in {elapsed:.1f} s "
+        f"({count / elapsed if elapsed else 0:.0f} rows/s)",
+        file=sys.stderr
+    )
+    return count
+
+def positive_int(value: str) -> int:
+    """argparse type for counts and widths that have to be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{value!r} is not a whole number")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value} must be at least 1")
+    return number
+
 def export_to_csv(filename: str, rows: list, headers: list):
     with open(filename, mode="w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
@@ -77,6 +382,70 @@ def main():
         "--csv", help="Optional CSV filename to export results.", default=None
     )
 
+    # --- Subcommand: search ---
+    p_search = subparsers.add_parser(
+        "search", help="Full-text search of case titles, litigants and attorneys, best matches first."
+    )
+    p_search.add_argument("text", help="Words to find (each must match, as a prefix).")
+    p_search.add_argument(
+        "--in", dest="column", choices=["case_title", "litigants", "attorneys"], default=None,
+        help="Only search this field."
+    )
+    p_search.add_argument("--limit", type=int, default=50, help="Maximum number of results (default 50).")
+    p_search.add_argument("--raw", action="store_true", help="Pass text through as an FTS5 query.")
+    p_search.add_argument(
+        "--csv", help="Optional CSV filename to export results.", default=None
+    )
+
+    # --- Subcommand: durations ---
+    p_durations = subparsers.add_parser(
+        "durations", help="Days from panel date to opinion (median, p90, p99) and pending cases."
+    )
+    p_durations.add_argument(
+        "--by", dest="dimension", choices=DURATION_DIMENSIONS, default="division",
+        help="Group by this (default division). month is the month the case was considered."
+    )
+    p_durations.add_argument(
+        "--csv", help="Optional CSV filename to export results.", default=None
+    )
+
+    # --- Subcommand: stats ---
+    p_stats = subparsers.add_parser(
+        "stats", help="Days to opinion: distribution by group, histogram and year over year (needs NumPy)."
+    )
+    p_stats.add_argument(
+        "--by", dest="dimension", choices=STATS_DIMENSIONS, default="division",
+        help="Group the distribution by this (default division). year is the year the case was considered."
+    )
+    p_stats.add_argument("--bin-days", type=positive_int, default=30, help="Histogram bin width in days (default 30).")
+    p_stats.add_argument(
+        "--csv", metavar="PREFIX", default=None,
+        help="Also export PREFIX-groups.csv, PREFIX-histogram.csv and PREFIX-trend.csv."
+    )
+
+    # --- Subcommand: export ---
+    p_export = subparsers.add_parser(
+        "export", help="Stream the results of a canned query or raw SQL to CSV or JSON Lines (optionally gzipped)."
+    )
+    source = p_export.add_mutually_exclusive_group(required=True)
+    source.add_argument("query", nargs="?", help="Canned query name (attorney-cases or one in data/metadata.json).")
+    source.add_argument("--sql", help="Raw SQL to run instead of a canned query.")
+    source.add_argument("--list", action="store_true", help="List the canned queries and their parameters.")
+    p_export.add_argument(
+        "--param", action="append", default=[], metavar="NAME=VALUE",
+        help="Value for a :NAME parameter of the query. Repeat for each parameter."
+    )
+    p_export.add_argument(
+        "-o", "--output", default="-",
+        help="Output file (default stdout). The format follows the extension, e.g. .jsonl or .csv.gz."
+    )
+    p_export.add_argument("--format", choices=EXPORT_FORMATS, default=None, help="Output format (default csv).")
+    p_export.add_argument("--gzip", action="store_true", help="Gzip the output.")
+    p_export.add_argument(
+        "--chunk-rows", type=positive_int, default=EXPORT_CHUNK_ROWS,
+        help=f"Rows fetched from the database at a time (default {EXPORT_CHUNK_ROWS})."
+    )
+
     # --- Subcommand: unique-attorneys ---
     subparsers.add_parser(
         "unique-attorneys", help="List unique attorney names."
@@ -99,6 +468,97 @@ def main():
         if args.csv:
             export_to_csv(args.csv, rows, headers)
 
+    elif args.command == "search":
+        # An empty MATCH (e.g. text that is all punctuation) is an FTS5 syntax error, not "no results"
+        if not (args.text if args.raw else fts_query(args.text)).strip():
+            parser.error("search text has no words to search for")
+        try:
+            rows = search_cases(args.text, args.column, args.limit, args.raw)
+        except sqlite3.OperationalError as e:
+            parser.error(f"invalid search query {args.text!r}: {e}")
+        headers = ["case_number", "case_title", "panel_date", "opinion_date", "division", "litigants", "attorneys"]
+        for row in rows[:10]:
+            print(row)
+        print(f"Total rows: {len(rows)}")
+        if args.csv:
+            export_to_csv(args.csv, rows, headers)
+
+    elif args.command == "durations":
+        rows = query_case_durations(args.dimension)
+        headers = [args.dimension, "decided", "median_days", "p90_days", "p99_days", "pending"]
+        print(f"{args.dimension:<40} {'decided':>8} {'median':>7} {'p90':>7} {'p99':>7} {'pending':>8}")
+        for label, decided, median, p90, p99, pending in rows:
+            print(
+                f"{label or '(all)':<40} {decided or 0:>8} {median if median is not None else '-':>7} "
+                f"{p90 if p90 is not None else '-':>7} {p99 if p99 is not None else '-':>7} {pending:>8}"
+            )
+        if args.csv:
+            export_to_csv(args.csv, rows, headers)
+
+    elif args.command == "stats":
+        groups, histogram, trend = case_stats(args.dimension, args.bin_days)
+
+        def dash(value):
+            return "-" if value is None else value
+
+        print(f"{args.dimension:<32} {'decided':>8} {'mean':>7} {'median':>7} {'p90':>7} {'p99':>7} {'pending':>8}")
+        for label, count, mean, median, p90, p99, pending in groups:
+            print(
+                f"{label:<32} {count:>8} {dash(mean):>7} {dash(median):>7} {dash(p90):>7} {dash(p99):>7} "
+                f"{pending:>8}"
+            )
+
+        print(f"\nDays to opinion ({args.bin_days}-day bins)")
+        widest = max((n for _, _, n in histogram), default=0)
+        for lo, hi, n in histogram:
+            bar = "#" * (round(40 * n / widest) if widest else 0)
+            print(f"{lo:>5}-{hi:<5} {n:>8} {bar}")
+
+        print(f"\n{'opinion year':<12} {'decided':>8} {'median':>7} {'change':>8}")
+        for year, count, median, change in trend:
+            change = "-" if change is None else f"{change:+.1f}%"
+            print(f"{year:<12} {count:>8} {median:>7} {change:>8}")
+
+        if args.csv:
+            export_to_csv(
+                f"{args.csv}-groups.csv", groups,
+                [args.dimension, "decided", "mean_days", "median_days", "p90_days", "p99_days", "pending"]
+            )
+            export_to_csv(f"{args.csv}-histogram.csv", histogram, ["from_days", "to_days", "cases"])
+            export_to_csv(f"{args.csv}-trend.csv", trend, ["opinion_year", "decided", "median_days", "change_pct"])
+
+    elif args.command == "export":
+        queries = canned_queries()
+        if args.list:
+            for name, sql in queries.items():
+                params = " ".join(f"--param {p}=..." for p in query_params(sql))
+                print(f"{name} {params}".rstrip())
+            return
+
+        if args.sql:
+            sql = args.sql
+        elif args.query in queries:
+            sql = queries[args.query]
+        else:
+            parser.error(f"unknown query {args.query!r}; see export --list")
+
+        params = {}
+        for param in args.param:
+            name, sep, value = param.partition("=")
+            if not sep:
+                parser.error(f"--param {param!r} is not NAME=VALUE")
+            params[name] = value
+        missing = [p for p in query_params(sql) if p not in params]
+        if missing:
+            parser.error("missing " + ", ".join(f"--param {p}=..." for p in missing))
+
+        fmt, compress = export_format(args.output, args.format, args.gzip)
+        try:
+            export_query(sql, params, args.output, fmt, compress, args.chunk_rows)
+        except sqlite3.Error as e:
+            print(f"❌ Export failed: {e}", file=sys.stderr)
+            sys.exit(1)
+
     elif args.command == "unique-attorneys":
         names = query_unique_attorneys()
         print(f"Total unique attorneys: {len(names)}")
@@ -12,6 +12,23 @@ def date1_less_than_date2(date1: str, date2: str) -> bool:
     d2 = datetime.strptime(date2, "%Y%m%d")
     return d1 < d2
 
+def date_range(start: str, end: str) -> list[str]:
+    """
+        Input: start and end date strings in the format yyyymmdd
+        Output: every date from start up to, but not including, end in yyyymmdd format
+
+        Same walk as looping with date1_less_than_date2/get_next_date, but parses the two
+        dates once instead of on every step.
+    """
+    d = datetime.strptime(start, "%Y%m%d").date()
+    end_date = datetime.strptime(end, "%Y%m%d").date()
+    one_day = timedelta(days=1)
+    result = []
+    while d < end_date:
+        result.append(d.strftime("%Y%m%d"))
+        d += one_day
+    return result
+
 def get_next_date(d: str) -> str:
     """
         Input: date string in the format yyyymmdd
@@ -25,6 +42,37 @@ def get_next_date(d: str) -> str:
     # Return in the same format
     return next_dt.strftime("%Y%m%d")
 
+def parse_stored_date(value: str) -> date:
+    """
+        Input: a date as stored in the db: yyyy-mm-dd, yyyymmdd (docket days) or mm/dd/yyyy (databases
+               from before schema version 3)
+        Output: date object
+    """
+    for fmt in ("%m/%d/%Y", "%Y-%m-%d", "%Y%m%d"):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized date: '{value}'")
+
+def parse_release_date(value: str) -> date:
+    """
+        Input: a date as the opinions release page shows it: "Jan. 25, 2025", "Sept. 3, 2020", and no period
+               or the full name for short months ("May 3, 2020", "June 3, 2020")
+        Output: date object
+    """
+    words = value.replace(".", " ").split()
+    # strptime's %b only knows "Sep"
+    if words and words[0].lower() == "sept":
+        words[0] = "Sep"
+    text = " ".join(words).replace(" ,", ",")
+    for fmt in ("%b %d, %Y", "%B %d, %Y"):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized date: '{value}'")
+
 def last_date_of_current_month() -> str:
     """
         Returns the date of the last day of the current month as a str in YYYYMMDD format 
@@ -1,41 +1,271 @@
+import atexit
 import sqlite3
 from datetime import datetime
+import json
 import os
+import threading
+
+from migrations import migrate
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, "..", "data", "cases.db")
 
-def get_connection() -> sqlite3.Connection:
-    """Open a SQLite connection with foreign keys enabled."""
-    conn = sqlite3.Connection(DB_PATH)
+# Per-opinion outcomes of apply_opinions_bulk
+OPINION_UPDATED = "updated"
+OPINION_INSERTED = "inserted"
+
+# Cases are keyed on (court_level, division, primary_case_number, panel_date), so writing a case we
+# already have (re-scraping a range) updates it in place instead of adding a copy. Opinion fields and the
+# lower court only ever get filled in, never blanked, by a write that doesn't know them.
+UPSERT_CASE_SQL = """
+    INSERT INTO cases
+    (division, case_title, panel_date, oral_arguments,
+     opinion_date, opinion_publication_status, disposition_status,
+     lower_court, lower_court_case_number, court_level, scraped_at, primary_case_number)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(court_level, division, primary_case_number, panel_date) DO UPDATE SET
+        case_title = excluded.case_title,
+        oral_arguments = excluded.oral_arguments,
+        opinion_date = COALESCE(excluded.opinion_date, cases.opinion_date),
+        opinion_publication_status = COALESCE(excluded.opinion_publication_status, cases.opinion_publication_status),
+        lower_court = COALESCE(NULLIF(excluded.lower_court, ''), cases.lower_court),
+        lower_court_case_number = COALESCE(NULLIF(excluded.lower_court_case_number, ''), cases.lower_court_case_number),
+        scraped_at = excluded.scraped_at
+    RETURNING id;
+"""
+UPSERT_CASE_NUMBER_SQL = """
+    INSERT INTO case_numbers (case_id, case_number, is_primary)
+    VALUES (?, ?, ?)
+    ON CONFLICT(case_id, case_number) DO UPDATE SET is_primary = excluded.is_primary;
+"""
+# Attorneys, judges and litigants are rows in people, keyed on the lowercase name. Add the names first
+# (add_people), then link them to the case by name with these.
+UPSERT_PERSON_SQL = """
+    INSERT INTO people (name, name_key)
+    VALUES (?1, lower(?1))
+    ON CONFLICT(name_key) DO NOTHING;
+"""
+UPSERT_JUDGE_SQL = """
+    INSERT INTO case_judges (case_id, person_id)
+    SELECT ?1, id FROM people WHERE name_key = lower(?2)
+    ON CONFLICT DO NOTHING;
+"""
+UPSERT_LITIGANT_SQL = """
+    INSERT INTO case_litigants (case_id, person_id, role)
+    SELECT ?1, id, ?3 FROM people WHERE name_key = lower(?2)
+    ON CONFLICT DO NOTHING;
+"""
+UPSERT_ATTORNEY_SQL = """
+    INSERT INTO case_attorneys (case_id, person_id)
+    SELECT ?1, id FROM people WHERE name_key = lower(?2)
+    ON CONFLICT DO NOTHING;
+"""
+# A re-scraped case drops the judges, litigants and attorneys the page no longer lists. ?2 is the JSON
+# array of names the case has now ([name, role] pairs for litigants).
+PRUNE_JUDGES_SQL = """
+    DELETE FROM case_judges
+    WHERE case_id = ?1
+      AND person_id NOT IN (SELECT id FROM people WHERE name_key IN (SELECT lower(value) FROM json_each(?2)));
+"""
+PRUNE_LITIGANTS_SQL = """
+    DELETE FROM case_litigants
+    WHERE case_id = ?1
+      AND NOT EXISTS (
+          SELECT 1
+          FROM json_each(?2) j
+          JOIN people p ON p.name_key = lower(json_extract(j.value, '$[0]'))
+          WHERE p.id = case_litigants.person_id AND json_extract(j.value, '$[1]') = case_litigants.role
+      );
+"""
+PRUNE_ATTORNEYS_SQL = """
+    DELETE FROM case_attorneys
+    WHERE case_id = ?1
+      AND person_id NOT IN (SELECT id FROM people WHERE name_key IN (SELECT lower(value) FROM json_each(?2)));
+"""
+
+def primary_case_number(case_numbers: list[tuple[str, bool]]) -> str | None:
+    """The case's primary number (the first one if none is marked primary), part of the case's key."""
+    numbers = [(num.strip(), is_primary) for num, is_primary in case_numbers if num and num.strip()]
+    for num, is_primary in numbers:
+        if is_primary:
+            return num
+    return numbers[0][0] if numbers else None
+
+# One long-lived connection per process. Opening a connection (and re-checking the schema) for every
+# month of opinions or every metadata read added up, and so did fsyncing a rollback journal on every
+# commit. The shared connection runs in WAL mode: commits append to the write-ahead log with one fsync at
+# checkpoints (synchronous=NORMAL), and readers such as a datasette instance left running against cases.db
+# don't block the scrapers or get blocked by them.
+SQLITE_CACHE_KIB = 64 * 1024           # page cache, in KiB
+SQLITE_MMAP_BYTES = 256 * 1024 * 1024  # read the db through mmap up to this size
+SQLITE_BUSY_TIMEOUT_MS = 5000          # wait this long for another process's write lock
+SQLITE_CACHED_STATEMENTS = 256         # prepared statements kept for reuse
+
+_shared_conn: sqlite3.Connection | None = None
+_shared_path: str | None = None
+_shared_lock = threading.Lock()
+
+def open_connection(db_path: str) -> sqlite3.Connection:
+    """A new tuned connection to db_path, migrated to the latest schema."""
+    conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=SQLITE_CACHED_STATEMENTS)
+    conn.execute("PRAGMA journal_mode = WAL;")
+    conn.execute("PRAGMA synchronous = NORMAL;")
+    conn.execute(f"PRAGMA cache_size = -{SQLITE_CACHE_KIB};")
+    conn.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_BYTES};")
+    conn.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS};")
     conn.execute("PRAGMA foreign_keys = ON;")
+    migrate(conn)
     return conn
 
+def get_connection() -> sqlite3.Connection:
+    """
+        The process's shared SQLite connection to DB_PATH, opened (and the schema migrated) on first use.
+        Callers still pair it with close_connection, which leaves the shared connection open for the next
+        caller; it is closed when the process exits.
+    """
+    global _shared_conn, _shared_path
+    with _shared_lock:
+        if _shared_conn is None or _shared_path != DB_PATH:
+            if _shared_conn is not None:
+                _shared_conn.close()
+            _shared_conn = open_connection(DB_PATH)
+            _shared_path = DB_PATH
+        return _shared_conn
+
 def close_connection(conn) -> None:
-    """Close a SQLite connection"""
-    conn.close()
+    """Close a SQLite connection. The shared connection from get_connection stays open for reuse."""
+    if conn is not _shared_conn:
+        conn.close()
 
-def update_metadata(key: str, value: str) -> None:
-    """Insert or update a key/value in the metadata table."""
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute("""
+@atexit.register
+def close_shared_connection() -> None:
+    """Close the shared connection, e.g. at exit. The next get_connection opens a new one."""
+    global _shared_conn, _shared_path
+    with _shared_lock:
+        if _shared_conn is not None:
+            # Let sqlite refresh the planner statistics it thinks are stale before we go
+            _shared_conn.execute("PRAGMA optimize;")
+            _shared_conn.close()
+        _shared_conn = None
+        _shared_path = None
+
+def update_metadata(key: str, value: str, conn: sqlite3.Connection | None = None) -> None:
+    """
+        Insert or update a key/value in the metadata table, through the shared connection unless given
+        another. If a transaction is open (e.g. a batch of cases the checkpoint describes), the write joins
+        it and commits with it; otherwise it commits on its own.
+    """
+    if conn is None:
+        conn = get_connection()
+    sql = """
         INSERT INTO metadata (key, value)
         VALUES (?, ?)
         ON CONFLICT(key) DO UPDATE SET value = excluded.value;
-    """, (key, value))
-    conn.commit()
-    conn.close()
+    """
+    if conn.in_transaction:
+        conn.execute(sql, (key, value))
+        return
+    with conn:
+        conn.execute(sql, (key, value))
 
-def get_metadata(key: str) -> str | None:
-    """Fetch a value from metadata table, or None if not set."""
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute("SELECT value FROM metadata WHERE key = ?", (key,))
-    row = cur.fetchone()
-    conn.close()
+def get_metadata(key: str, conn: sqlite3.Connection | None = None) -> str | None:
+    """Fetch a value from metadata table, or None if not set. Uses the shared connection unless given another."""
+    if conn is None:
+        conn = get_connection()
+    row = conn.execute("SELECT value FROM metadata WHERE key = ?", (key,)).fetchone()
     return row[0] if row else None
 
+def record_opinions_month(conn: sqlite3.Connection, year: int, month: int) -> None:
+    """Mark a month of opinion releases as scraped. Caller controls the transaction."""
+    scraped_at = datetime.utcnow().isoformat(timespec="seconds")
+    conn.execute("""
+        INSERT INTO opinions_metadata (year, month, scraped_at)
+        VALUES (?, ?, ?)
+        ON CONFLICT(year, month) DO UPDATE SET scraped_at = excluded.scraped_at;
+    """, (year, month, scraped_at))
+
+def record_opinion_volume(conn: sqlite3.Connection, year: int, month: int, opinion_count: int) -> None:
+    """Remember how many opinions were released in a month. Caller controls the transaction."""
+    updated_at = datetime.utcnow().isoformat(timespec="seconds")
+    conn.execute("""
+        INSERT INTO opinion_volume (year, month, opinion_count, updated_at)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(year, month) DO UPDATE SET
+            opinion_count = excluded.opinion_count,
+            updated_at = excluded.updated_at;
+    """, (year, month, opinion_count, updated_at))
+
+def get_opinion_volumes(conn: sqlite3.Connection, year: int) -> dict[int, int]:
+    """month -> number of opinions released, for the months of the year we've seen."""
+    cur = conn.execute("SELECT month, opinion_count FROM opinion_volume WHERE year = ?", (year,))
+    return {row[0]: row[1] for row in cur.fetchall()}
+
+def get_scraped_opinion_months(conn: sqlite3.Connection, year: int) -> set[int]:
+    """The months of the year whose opinion releases have been scraped."""
+    cur = conn.execute("SELECT month FROM opinions_metadata WHERE year = ?", (year,))
+    return {row[0] for row in cur.fetchall()}
+
+def record_docket_day(conn: sqlite3.Connection, division: int, docket_date: str, case_count: int) -> None:
+    """
+        Remember how many cases a division's docket page (docket_date in yyyymmdd format) had when we
+        last looked. This is the sitting calendar the schedule scraper learns from past runs. Caller
+        controls the transaction.
+    """
+    checked_at = datetime.utcnow().date().strftime("%Y%m%d")
+    conn.execute("""
+        INSERT INTO docket_days (division, docket_date, case_count, checked_at)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(division, docket_date) DO UPDATE SET
+            case_count = excluded.case_count,
+            checked_at = excluded.checked_at;
+    """, (division, docket_date, case_count, checked_at))
+
+def get_known_empty_docket_days(conn: sqlite3.Connection, division: int, start: str, end: str) -> set[str]:
+    """
+        Dates (yyyymmdd) between start and end on which the division's docket page was empty when checked
+        after the date had passed. Dockets are posted ahead of time, so an empty page for a past date
+        stays empty and doesn't need to be fetched again.
+    """
+    cur = conn.execute("""
+        SELECT docket_date
+        FROM docket_days
+        WHERE division = ? AND docket_date >= ? AND docket_date < ?
+          AND case_count = 0 AND checked_at > docket_date
+    """, (division, start, end))
+    return {row[0] for row in cur.fetchall()}
+
+def get_docket_page_versions(conn: sqlite3.Connection, division: int, start: str, end: str) -> dict[str, tuple[str, str | None, str | None]]:
+    """
+        The version of each of the division's docket pages (docket_date in yyyymmdd format) between start and
+        end we last ingested, as docket_date -> (content_hash, etag, last_modified)
+    """
+    cur = conn.execute("""
+        SELECT docket_date, content_hash, etag, last_modified
+        FROM docket_page_versions
+        WHERE division = ? AND docket_date >= ? AND docket_date < ?
+    """, (division, start, end))
+    return {row[0]: (row[1], row[2], row[3]) for row in cur.fetchall()}
+
+def record_docket_page_version(
+    conn: sqlite3.Connection,
+    division: int,
+    docket_date: str,
+    content_hash: str,
+    etag: str | None,
+    last_modified: str | None
+) -> None:
+    """Remember which version of a docket page was ingested. Caller controls the transaction."""
+    fetched_at = datetime.utcnow().isoformat(timespec="seconds")
+    conn.execute("""
+        INSERT INTO docket_page_versions (division, docket_date, content_hash, etag, last_modified, fetched_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(division, docket_date) DO UPDATE SET
+            content_hash = excluded.content_hash,
+            etag = excluded.etag,
+            last_modified = excluded.last_modified,
+            fetched_at = excluded.fetched_at;
+    """, (division, docket_date, content_hash, etag, last_modified, fetched_at))
+
 def insert_case_with_details(
     conn: sqlite3.Connection,
     division: str,
@@ -54,21 +284,14 @@ def insert_case_with_details(
     court_level: str = "appeals"
 ):
     """
-        Insert a single case and its related data using an existing connection. Caller controls transaction
-        and must call commit().
+        Insert (or update, if we already have it) a single case and its related data using an existing
+        connection. Caller controls transaction and must call commit(). Returns the case id.
     """
     cur = conn.cursor()
-    cur.execute("PRAGMA foreign_keys = ON;")
     scraped_at = datetime.utcnow().isoformat(timespec="seconds")
 
-    # Insert into cases
-    cur.execute("""
-        INSERT OR IGNORE INTO cases
-        (division, case_title, panel_date, oral_arguments,
-         opinion_date, opinion_publication_status, disposition_status,
-         lower_court, lower_court_case_number, court_level, scraped_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
+    # Upsert into cases
+    cur.execute(UPSERT_CASE_SQL, (
         division,
         case_title,
         panel_date,
@@ -79,47 +302,214 @@ def insert_case_with_details(
         lower_court,
         lower_court_case_number,
         court_level,
-        scraped_at
+        scraped_at,
+        primary_case_number(case_numbers)
     ))
-    case_id = cur.lastrowid
+    case_id = cur.fetchone()[0]
 
     # case_numbers
     for num, is_primary in case_numbers:
         num = num.strip()
         if num:
-            cur.execute("""
-                INSERT OR IGNORE INTO case_numbers (case_id, case_number, is_primary)
-                VALUES (?, ?, ?)
-            """, (case_id, num, 1 if is_primary else 0))
+            cur.execute(UPSERT_CASE_NUMBER_SQL, (case_id, num, 1 if is_primary else 0))
+
+    judges = [judge.strip() for judge in judges if judge.strip()]
+    litigants = [(name.strip(), role.strip() if role else "") for name, role in litigants if name.strip()]
+    attorneys = [attorney.strip() for attorney in attorneys if attorney.strip()]
+    add_people(cur, [*judges, *(name for name, _ in litigants), *attorneys])
 
     # judges
     for judge in judges:
-        judge = judge.strip()
-        if judge:
-            cur.execute("""
-                INSERT OR IGNORE INTO judges (case_id, name)
-                VALUES (?, ?)
-            """, (case_id, judge))
+        cur.execute(UPSERT_JUDGE_SQL, (case_id, judge))
 
     # litigants
     for name, role in litigants:
-        name = name.strip()
-        role = role.strip() if role else ""
-        if name:
-            cur.execute("""
-                INSERT OR IGNORE INTO litigants (case_id, name, role)
-                VALUES (?, ?, ?)
-            """, (case_id, name, role))
+        cur.execute(UPSERT_LITIGANT_SQL, (case_id, name, role))
 
     # attorneys
     for attorney in attorneys:
-        attorney = attorney.strip()
-        if attorney:
-            cur.execute("""
-                INSERT OR IGNORE INTO attorneys (case_id, name)
-                VALUES (?, ?)
-            """, (case_id, attorney))
+        cur.execute(UPSERT_ATTORNEY_SQL, (case_id, attorney))
 
+    # and whoever the page doesn't list anymore
+    cur.execute(PRUNE_JUDGES_SQL, (case_id, json.dumps(judges)))
+    cur.execute(PRUNE_LITIGANTS_SQL, (case_id, json.dumps(litigants)))
+    cur.execute(PRUNE_ATTORNEYS_SQL, (case_id, json.dumps(attorneys)))
+
+    refresh_case_search(conn, [case_id])
+    refresh_case_durations(conn, [case_id])
+    return case_id
+
+
+def insert_cases_bulk(conn: sqlite3.Connection, division: str, cases: list) -> list[int]:
+    """
+        Insert a batch of cases (objects with the fields of get_argument_dates.CaseData, e.g. a docket day or
+        month) and their related data using an existing connection. Caller controls transaction.
+
+        Writes the same rows as calling insert_case_with_details for each case: each case is upserted on
+        its natural key (one prepared statement per case, for its id), then all the child rows go in, and
+        the judges, litigants and attorneys the cases no longer list come out, with one executemany per
+        table.
+
+        Output: the case ids (new or existing), in the order of the cases
+    """
+    if not cases:
+        return []
+
+    cur = conn.cursor()
+    scraped_at = datetime.utcnow().isoformat(timespec="seconds")
+
+    case_ids = []
+    number_rows = []
+    judge_rows = []
+    litigant_rows = []
+    attorney_rows = []
+    # case id -> the names it has now. The same case twice in a batch keeps the later one's, as it would
+    # writing them one at a time.
+    current_names = {}
+    for case in cases:
+        cur.execute(UPSERT_CASE_SQL, (
+            division,
+            case.case_title,
+            case.argument_date,
+            1 if case.oral_argument else 0,
+            None,
+            None,
+            "normal",
+            case.lower_court,
+            case.lower_court_case_number,
+            "appeals",
+            scraped_at,
+            primary_case_number(case.case_numbers)
+        ))
+        case_id = cur.fetchone()[0]
+        case_ids.append(case_id)
+        for num, is_primary in case.case_numbers:
+            num = num.strip()
+            if num:
+                number_rows.append((case_id, num, 1 if is_primary else 0))
+        judges = [judge.strip() for judge in case.panel if judge.strip()]
+        litigants = [(name.strip(), role.strip() if role else "") for name, role in case.litigants if name.strip()]
+        attorneys = [attorney.strip() for attorney in case.attorneys if attorney.strip()]
+        judge_rows.extend((case_id, judge) for judge in judges)
+        litigant_rows.extend((case_id, name, role) for name, role in litigants)
+        attorney_rows.extend((case_id, attorney) for attorney in attorneys)
+        current_names[case_id] = (json.dumps(judges), json.dumps(litigants), json.dumps(attorneys))
+
+    cur.executemany(UPSERT_CASE_NUMBER_SQL, number_rows)
+    add_people(cur, [row[1] for rows in (judge_rows, litigant_rows, attorney_rows) for row in rows])
+    cur.executemany(UPSERT_JUDGE_SQL, judge_rows)
+    cur.executemany(UPSERT_LITIGANT_SQL, litigant_rows)
+    cur.executemany(UPSERT_ATTORNEY_SQL, attorney_rows)
+    cur.executemany(PRUNE_JUDGES_SQL, [(case_id, names[0]) for case_id, names in current_names.items()])
+    cur.executemany(PRUNE_LITIGANTS_SQL, [(case_id, names[1]) for case_id, names in current_names.items()])
+    cur.executemany(PRUNE_ATTORNEYS_SQL, [(case_id, names[2]) for case_id, names in current_names.items()])
+
+    refresh_case_search(conn, sorted(set(case_ids)))
+    refresh_case_durations(conn, sorted(set(case_ids)))
+    return case_ids
+
+def add_people(cur: sqlite3.Cursor, names: list[str]) -> None:
+    """Make sure each name has a row in people. A name we already have (in any capitalization) is left as is."""
+    names = {name.strip() for name in names if name and name.strip()}
+    cur.executemany(UPSERT_PERSON_SQL, [(name,) for name in sorted(names)])
+
+def refresh_case_search(conn: sqlite3.Connection, case_ids: list[int]) -> None:
+    """
+        Rebuild the case_search full-text rows of the given cases from cases, litigants and attorneys. Call
+        after writing a case or its names. Caller controls transaction.
+    """
+    if not case_ids:
+        return
+    ids = json.dumps(case_ids)
+    conn.execute("DELETE FROM case_search WHERE rowid IN (SELECT value FROM json_each(?));", (ids,))
+    conn.execute("""
+        INSERT INTO case_search (rowid, case_title, litigants, attorneys)
+        SELECT
+            c.id,
+            c.case_title,
+            (SELECT group_concat(p.name, ' ; ')
+             FROM case_litigants t JOIN people p ON p.id = t.person_id WHERE t.case_id = c.id),
+            (SELECT group_concat(p.name, ' ; ')
+             FROM case_attorneys t JOIN people p ON p.id = t.person_id WHERE t.case_id = c.id)
+        FROM cases c
+        WHERE c.id IN (SELECT value FROM json_each(?));
+    """, (ids,))
+
+# The groupings a case counts towards in the duration analytics (see migrations._case_durations). ?1 is a
+# json array of case ids.
+ISO_DATE_GLOB = "[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]"
+CASE_DURATION_FACTS_SQL = f"""
+    WITH c AS (
+        SELECT
+            id,
+            division,
+            substr(panel_date, 1, 7) AS month,
+            COALESCE(NULLIF(opinion_publication_status, ''), 'unknown') AS status,
+            CAST(julianday(opinion_date) - julianday(panel_date) AS INTEGER) AS days
+        FROM cases
+        WHERE id IN (SELECT value FROM json_each(?1))
+          AND panel_date GLOB '{ISO_DATE_GLOB}'
+          AND (opinion_date IS NULL OR (opinion_date GLOB '{ISO_DATE_GLOB}' AND opinion_date >= panel_date))
+    )
+    INSERT INTO case_duration_facts (case_id, dimension, label, days)
+    SELECT id, 'all', '', days FROM c
+    UNION ALL SELECT id, 'division', division, days FROM c
+    UNION ALL SELECT id, 'month', month, days FROM c
+    UNION ALL SELECT id, 'publication_status', status, days FROM c WHERE days IS NOT NULL
+    UNION ALL
+    SELECT c.id, 'judge', p.name, c.days
+    FROM c JOIN case_judges j ON j.case_id = c.id JOIN people p ON p.id = j.person_id;
+"""
+# Add (?2 = 1) or take back (?2 = -1) what the facts of the cases in ?1 count towards
+CASE_DURATION_HISTOGRAM_SQL = """
+    INSERT INTO case_duration_histogram (dimension, label, days, cases)
+    SELECT dimension, label, days, ?2 * COUNT(*)
+    FROM case_duration_facts
+    WHERE case_id IN (SELECT value FROM json_each(?1)) AND days IS NOT NULL
+    GROUP BY dimension, label, days
+    ON CONFLICT(dimension, label, days) DO UPDATE SET cases = cases + excluded.cases;
+"""
+CASE_DURATION_BACKLOG_SQL = """
+    INSERT INTO case_duration_backlog (dimension, label, cases)
+    SELECT dimension, label, ?2 * COUNT(*)
+    FROM case_duration_facts
+    WHERE case_id IN (SELECT value FROM json_each(?1)) AND days IS NULL
+    GROUP BY dimension, label
+    ON CONFLICT(dimension, label) DO UPDATE SET cases = cases + excluded.cases;
+"""
+
+def refresh_case_durations(conn: sqlite3.Connection, case_ids: list[int]) -> None:
+    """
+        Bring the duration analytics up to date for the given cases: take back what they counted towards
+        before, then add what they count towards now. Costs a few index lookups per case however big the
+        database is. Call after writing a case, its judges or its opinion. Caller controls transaction.
+    """
+    if not case_ids:
+        return
+    ids = json.dumps(case_ids)
+    conn.execute(CASE_DURATION_HISTOGRAM_SQL, (ids, -1))
+    conn.execute(CASE_DURATION_BACKLOG_SQL, (ids, -1))
+    # Drop the buckets that just emptied, so the stats don't list groupings with no cases
+    conn.execute("""
+        DELETE FROM case_duration_histogram
+        WHERE cases = 0
+          AND (dimension, label, days) IN (
+            SELECT dimension, label, days FROM case_duration_facts
+            WHERE case_id IN (SELECT value FROM json_each(?1))
+          );
+    """, (ids,))
+    conn.execute("""
+        DELETE FROM case_duration_backlog
+        WHERE cases = 0
+          AND (dimension, label) IN (
+            SELECT dimension, label FROM case_duration_facts
+            WHERE case_id IN (SELECT value FROM json_each(?1))
+          );
+    """, (ids,))
+    conn.execute("DELETE FROM case_duration_facts WHERE case_id IN (SELECT value FROM json_each(?1));", (ids,))
+    conn.execute(CASE_DURATION_FACTS_SQL, (ids,))
+    conn.execute(CASE_DURATION_HISTOGRAM_SQL, (ids, 1))
+    conn.execute(CASE_DURATION_BACKLOG_SQL, (ids, 1))
 
 def update_case_opinion(
     conn: sqlite3.Connection,
@@ -146,12 +536,110 @@ def update_case_opinion(
 
     case_id = row[0]
 
-    # Update the opinion fields
+    # Update the opinion fields. scraped_at too, so incremental snapshot exports see the change.
     cur.execute("""
         UPDATE cases
-        SET opinion_date = ?, opinion_publication_status = ?
+        SET opinion_date = ?, opinion_publication_status = ?, scraped_at = ?
         WHERE id = ?
-    """, (opinion_date, opinion_type, case_id))
+    """, (opinion_date, opinion_type, datetime.utcnow().isoformat(timespec="seconds"), case_id))
+    updated = cur.rowcount > 0
+    refresh_case_durations(conn, [case_id])
 
     # No commit here — caller controls transaction boundaries
-    return cur.rowcount > 0
+    return updated
+
+def apply_opinions_bulk(conn: sqlite3.Connection, opinions: list) -> list[str]:
+    """
+        Records a batch of opinion releases (objects with case_number, case_title, division, opinion_date
+        and opinion_type, like get_opinions.Opinion) using an existing connection. Caller controls the
+        transaction.
+
+        Same outcome as calling update_case_opinion for each opinion and inserting a bare case when it
+        finds nothing, but set-based: the batch goes into a temp table, case numbers are resolved with one
+        join on the case_number index, the unmatched cases are inserted with executemany, and every case
+        gets its opinion fields from a single UPDATE ... FROM.
+
+        Output: OPINION_UPDATED or OPINION_INSERTED for each opinion, in order. An opinion whose case
+                number appears earlier in the batch without a matching case counts as an update of the
+                case inserted for that earlier row.
+    """
+    cur = conn.cursor()
+    cur.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS opinion_batch (
+            seq INTEGER PRIMARY KEY,
+            case_number TEXT NOT NULL,
+            case_title TEXT,
+            division TEXT,
+            opinion_date TEXT,
+            opinion_type TEXT,
+            case_id INTEGER
+        );
+    """)
+    cur.execute("DELETE FROM opinion_batch;")
+    cur.executemany("""
+        INSERT INTO opinion_batch (seq, case_number, case_title, division, opinion_date, opinion_type)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, [
+        (seq, op.case_number, op.case_title, op.division, op.opinion_date, op.opinion_type)
+        for seq, op in enumerate(opinions)
+    ])
+
+    # Resolve case numbers to cases. Several cases can share a number (e.g. consolidated cases); like
+    # update_case_opinion, take the first.
+    cur.execute("""
+        UPDATE opinion_batch
+        SET case_id = matched.case_id
+        FROM (
+            SELECT b.seq, MIN(cn.case_id) AS case_id
+            FROM opinion_batch b
+            JOIN case_numbers cn ON cn.case_number = b.case_number
+            GROUP BY b.seq
+        ) AS matched
+        WHERE opinion_batch.seq = matched.seq;
+    """)
+    outcomes = [OPINION_UPDATED] * len(opinions)
+
+    # Cases we never saw on a docket page. Upsert one bare case per case number, keyed with an empty
+    # panel_date, so finding the same opinion again on a later run reuses that case.
+    unmatched = cur.execute("""
+        SELECT seq, case_number, case_title, division
+        FROM opinion_batch
+        WHERE case_id IS NULL
+          AND seq IN (SELECT MIN(seq) FROM opinion_batch WHERE case_id IS NULL GROUP BY case_number)
+        ORDER BY seq;
+    """).fetchall()
+    if unmatched:
+        scraped_at = datetime.utcnow().isoformat(timespec="seconds")
+        new_cases = []
+        for seq, case_number, case_title, division in unmatched:
+            cur.execute(UPSERT_CASE_SQL, (
+                division, case_title, "", 0, None, None, "normal", "", "", "appeals", scraped_at, case_number
+            ))
+            new_cases.append((cur.fetchone()[0], case_number))
+            outcomes[seq] = OPINION_INSERTED
+
+        cur.executemany(UPSERT_CASE_NUMBER_SQL, [(case_id, case_number, 0) for case_id, case_number in new_cases])
+        cur.executemany("""
+            UPDATE opinion_batch SET case_id = ? WHERE case_id IS NULL AND case_number = ?
+        """, new_cases)
+        refresh_case_search(conn, [case_id for case_id, _ in new_cases])
+
+    # One pass over cases. When a case appears more than once in the batch the last row wins, as it
+    # would have updating row by row. scraped_at is bumped like update_case_opinion does.
+    cur.execute("""
+        UPDATE cases
+        SET opinion_date = latest.opinion_date,
+            opinion_publication_status = latest.opinion_type,
+            scraped_at = ?
+        FROM (
+            SELECT case_id, opinion_date, opinion_type
+            FROM opinion_batch
+            WHERE seq IN (SELECT MAX(seq) FROM opinion_batch GROUP BY case_id)
+        ) AS latest
+        WHERE cases.id = latest.case_id;
+    """, (datetime.utcnow().isoformat(timespec="seconds"),))
+    case_ids = [row[0] for row in cur.execute("SELECT DISTINCT case_id FROM opinion_batch ORDER BY case_id;")]
+    refresh_case_durations(conn, case_ids)
+    cur.execute("DELETE FROM opinion_batch;")
+
+    return outcomes
@@ -0,0 +1,143 @@
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from typing import Callable
+
+from db_ops import get_connection
+
+# The scrapers used to stop fetching while each batch was committed, so the network and the disk took turns.
+# DbWriter moves the writes to a thread of their own: the scraper hands it a write as soon as a page is
+# parsed and carries on fetching while the writer commits.
+#
+# Writes are grouped into larger transactions (up to max_batch writes, or whatever arrived within max_delay
+# seconds of the first), which saves a commit per docket day or opinions window. They are applied strictly
+# in the order they were submitted, so a checkpoint written with a batch still means "everything up to here
+# is in the db".
+#
+# A write that raises (e.g. write_cases after more than 5 bad cases) is rolled back, the writes committed
+# before it stay committed, and nothing after it is applied: the error is re-raised in the scraper's
+# thread by the next submit/flush/close, the same as when the scraper wrote inline.
+
+DEFAULT_QUEUE_SIZE = 32
+DEFAULT_MAX_BATCH = 50
+DEFAULT_MAX_DELAY = 2.0
+
+# Tells the writer thread to finish up
+_STOP = object()
+
+class DbWriter:
+    def __init__(
+        self,
+        conn: sqlite3.Connection | None = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_delay: float = DEFAULT_MAX_DELAY
+    ) -> None:
+        # While the writer runs, it is the only user of the connection
+        self.conn = conn if conn is not None else get_connection()
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        # Bounded, so a scraper that outruns the disk waits instead of piling up parsed pages in memory
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._error: BaseException | None = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, write: Callable[[sqlite3.Connection], None], description: str = "") -> None:
+        """
+            Queue write(conn) to run on the writer thread, inside a transaction the writer controls (so it
+            must not commit or roll back itself). Blocks while the queue is full. Raises the error of an
+            earlier write that failed.
+        """
+        self._raise_if_failed()
+        self._queue.put((write, description))
+
+    def flush(self) -> None:
+        """Wait until everything submitted so far is committed. Raises the error of a write that failed."""
+        self._queue.join()
+        self._raise_if_failed()
+
+    def close(self) -> None:
+        """Commit what's queued and stop the writer thread. Raises the error of a write that failed."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._raise_if_failed()
+
+    def __enter__(self) -> "DbWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        # Already unwinding from an error in the scraper. Still commit what was handed over, but don't
+        # let a writer error hide the original one.
+        try:
+            self.close()
+        except Exception as e:
+            logging.error(f"❌ Database writer also failed: {e}")
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+
+            # Group whatever else arrives soon after into the same transaction
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    self._queue.task_done()
+                    break
+                batch.append(item)
+
+            try:
+                if self._error is None:
+                    self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, batch: list[tuple[Callable[[sqlite3.Connection], None], str]]) -> None:
+        conn = self.conn
+        try:
+            if not conn.in_transaction:
+                conn.execute("BEGIN;")
+            for write, description in batch:
+                conn.execute("SAVEPOINT writer_job;")
+                try:
+                    write(conn)
+                except Exception as e:
+                    # Keep the writes before this one, lose this one and drop the rest
+                    conn.execute("ROLLBACK TO writer_job;")
+                    conn.execute("RELEASE writer_job;")
+                    logging.error(f"❌ Database write failed ({description}): {e}. Rolled back.")
+                    self._error = e
+                    break
+                conn.execute("RELEASE writer_job;")
+            conn.commit()
+        except Exception as e:
+            logging.exception(f"❌ Database writer failed committing a batch of {len(batch)} writes: {e}")
+            conn.rollback()
+            if self._error is None:
+                self._error = e
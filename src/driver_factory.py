@@ -1,11 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 import os
 import platform
-from typing import Optional
+import queue
+import shutil
+import socket
+import tempfile
+from typing import Iterator, Optional
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 
-def create_driver(project_root: Optional[str] = None, headless: bool =True) -> webdriver.Chrome:
+def create_driver(
+    project_root: Optional[str] = None,
+    headless: bool =True,
+    debugging_port: int = 9222,
+    user_data_dir: Optional[str] = None
+) -> webdriver.Chrome:
     # Resolve project root if not provided
     if project_root is None:
         # Assume this file is in root
@@ -43,8 +54,86 @@ def create_driver(project_root: Optional[str] = None, headless: bool =True) -> w
     options.add_argument("--disable-dev-shm-usage")
     options.add_argument("--disable-gpu")
     options.add_argument("--disable-software-rasterizer")
-    options.add_argument("--remote-debugging-port=9222")
+    options.add_argument(f"--remote-debugging-port={debugging_port}")
+    # Chrome instances sharing a profile dir lock each other out, so each driver in a pool gets its own
+    if user_data_dir is not None:
+        options.add_argument(f"--user-data-dir={user_data_dir}")
 
     service = Service(driver_binary)
     driver = webdriver.Chrome(service=service, options=options)
     return driver
+
+def find_free_port() -> int:
+    # Let the OS pick an unused port. Small window for a race before Chrome binds it, but good enough
+    # for a handful of drivers on one box.
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+class DriverPool:
+    """
+        A fixed set of isolated headless Chrome instances, each with its own debugging port and temp profile
+        dir, lent out to one worker at a time:
+
+            with DriverPool(4) as pool:
+                with pool.driver() as driver:
+                    driver.get(url)
+
+        A driver is only ever used by the worker holding it, so workers can run on separate threads.
+    """
+    def __init__(self, size: int, project_root: Optional[str] = None, headless: bool = True) -> None:
+        if size < 1:
+            raise ValueError("DriverPool size must be at least 1")
+
+        self._drivers: list[webdriver.Chrome] = []
+        self._profile_dirs: list[str] = []
+        self._idle: queue.Queue = queue.Queue()
+
+        def start(_: int) -> webdriver.Chrome:
+            profile_dir = tempfile.mkdtemp(prefix="wa-opinions-chrome-")
+            self._profile_dirs.append(profile_dir)
+            return create_driver(project_root, headless, find_free_port(), profile_dir)
+
+        # Chrome takes a couple of seconds to start; start them all at once
+        with ThreadPoolExecutor(max_workers=size) as executor:
+            futures = [executor.submit(start, i) for i in range(size)]
+
+        errors = [f.exception() for f in futures if f.exception() is not None]
+        self._drivers = [f.result() for f in futures if f.exception() is None]
+        if errors:
+            # Don't leave orphaned Chrome processes behind if one of them failed to start
+            self.close()
+            raise errors[0]
+
+        for driver in self._drivers:
+            self._idle.put(driver)
+
+    @property
+    def size(self) -> int:
+        return len(self._drivers)
+
+    @contextmanager
+    def driver(self) -> Iterator[webdriver.Chrome]:
+        """Borrow a driver, waiting until one is free. It goes back to the pool when the block exits."""
+        driver = self._idle.get()
+        try:
+            yield driver
+        finally:
+            self._idle.put(driver)
+
+    def close(self) -> None:
+        for driver in self._drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        self._drivers = []
+        for profile_dir in self._profile_dirs:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+        self._profile_dirs = []
+
+    def __enter__(self) -> "DriverPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from driver_factory import DriverPool
+
+# Fetch backends for pages that are plain GETs (e.g. the docket pages) or simple form submissions (the
+# opinions search). Both backends hand back the raw html of a page, which the caller parses locally (see
+# page_parser.py).
+#
+# - HttpFetcher talks to the court website directly over a pooled keep-alive session. No browser, so
+#   no Chrome startup, no ~300 MB process, and no render latency.
+# - SeleniumFetcher drives headless Chrome like the scrapers always have. It's here for pages that
+#   need a browser and as a fallback if the site ever starts refusing plain http clients.
+
+BACKEND_HTTP = "http"
+BACKEND_SELENIUM = "selenium"
+
+# Some sites answer differently to python-requests' default user agent. Look like the browser we used to drive.
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/127.0.6533.72 Safari/537.36"
+)
+
+@dataclass(slots=True)
+class FetchedPage:
+    html: str
+    etag: str | None = None
+    last_modified: str | None = None
+    # True when a conditional request came back 304; html is empty then
+    not_modified: bool = False
+
+class HttpFetcher:
+    def __init__(self, pool_size: int = 10, timeout: float = 30.0, retries: int = 3) -> None:
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT})
+
+        # Retry transient failures (connection resets, 5xx, throttling) with backoff instead of
+        # failing a multi-hour run on one bad response
+        retry = Retry(
+            total=retries,
+            backoff_factor=1.0,
+            status_forcelist=(429, 500, 502, 503, 504),
+            # POST is only used to submit searches, which are as safe to repeat as a GET
+            allowed_methods=("GET", "HEAD", "POST"),
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def fetch(self, url: str) -> str:
+        """
+            Input: url to GET
+            Output: html of the page. A missing page (404) comes back as an empty string, the same as a
+                    docket day without content.
+        """
+        return self.fetch_page(url).html
+
+    def fetch_page(self, url: str, etag: str | None = None, last_modified: str | None = None) -> FetchedPage:
+        """
+            Like fetch, but makes a conditional request when given the ETag/Last-Modified of the copy we
+            already have, and returns the validators the server sent with the page.
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        resp = self.session.get(url, timeout=self.timeout, headers=headers)
+        if resp.status_code == 304:
+            return FetchedPage(html="", etag=etag, last_modified=last_modified, not_modified=True)
+        if resp.status_code == 404:
+            return FetchedPage(html="")
+        resp.raise_for_status()
+        # Without a charset in the Content-Type header requests assumes ISO-8859-1 for text/html
+        if "charset" not in resp.headers.get("Content-Type", "").lower():
+            resp.encoding = "utf-8"
+        return FetchedPage(
+            html=resp.text,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+        )
+
+    def submit(self, url: str, method: str = "GET", data: dict[str, str] | None = None) -> str:
+        """
+            Submits a form (e.g. the opinions search) the way a browser would and returns the html of the
+            response.
+        """
+        if method.upper() == "POST":
+            resp = self.session.post(url, data=data, timeout=self.timeout)
+        else:
+            resp = self.session.get(url, params=data, timeout=self.timeout)
+        resp.raise_for_status()
+        if "charset" not in resp.headers.get("Content-Type", "").lower():
+            resp.encoding = "utf-8"
+        return resp.text
+
+    def close(self) -> None:
+        self.session.close()
+
+class SeleniumFetcher:
+    def __init__(self, pool_size: int = 1) -> None:
+        # One Chrome instance per concurrent worker
+        self.pool = DriverPool(pool_size)
+
+    def fetch(self, url: str) -> str:
+        with self.pool.driver() as driver:
+            driver.get(url)
+            return driver.page_source
+
+    def fetch_page(self, url: str, etag: str | None = None, last_modified: str | None = None) -> FetchedPage:
+        # A browser can't make conditional requests for us; always a full page
+        return FetchedPage(html=self.fetch(url))
+
+    def close(self) -> None:
+        self.pool.close()
+
+def create_fetcher(backend: str, workers: int = 1):
+    if backend == BACKEND_HTTP:
+        # Keep at least as many pooled connections as there are workers using the session
+        return HttpFetcher(pool_size=max(workers, 10))
+    if backend == BACKEND_SELENIUM:
+        return SeleniumFetcher(pool_size=workers)
+    raise ValueError(f"Unknown fetch backend: {backend}")
@@ -3,8 +3,9 @@
 # Std library imports
 import argparse
 from dataclasses import dataclass
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from dateutil.relativedelta import relativedelta
+import hashlib
 import logging
 import os
 import re
@@ -13,9 +14,17 @@ import re
 from selenium.webdriver.common.by import By
 
 # Local imports
-from date_utils import date1_less_than_date2, get_next_date, last_day_of_current_year 
-from db_ops import get_connection, close_connection, update_metadata, insert_case_with_details
-from driver_factory import create_driver
+from date_utils import date_range, last_day_of_current_year, parse_stored_date
+from db_ops import (
+    get_connection, close_connection, update_metadata, get_metadata, insert_case_with_details,
+    insert_cases_bulk,
+    record_docket_day, get_known_empty_docket_days, get_docket_page_versions, record_docket_page_version
+)
+from db_writer import DbWriter
+from fetchers import BACKEND_HTTP, BACKEND_SELENIUM, create_fetcher
+from page_cache import CachingFetcher, PageCache, ReplayFetcher
+from page_parser import PageElement, parse_docket_index, parse_strong_elements
+from parallel import DEFAULT_MAX_RPS, RateLimiter, imap_ordered
 
 # This program loops through a subset of the Washington State Court of Appeals hearing schedule, captures the information 
 # I'm interested in, and writes the information to a sqlite database. 
@@ -55,27 +64,46 @@ logging.basicConfig(
     ]
 )
 
+# How a fetched docket page gets turned into elements. page-source takes one snapshot of the html and parses
+# it locally; webdriver asks chromedriver for each element and its text, one round-trip at a time.
+PARSER_PAGE_SOURCE = "page-source"
+PARSER_WEBDRIVER = "webdriver"
+
+# How the scraper decides which docket pages to fetch:
+# - index: read the division's folder/year index page and fetch only the docket files it links to
+# - calendar: probe every date, except dates the sitting calendar learned from past runs (the docket_days
+#   table) knows had an empty page
+# - none: probe every date
+# index falls back to calendar for any year whose index page lists nothing.
+DISCOVERY_INDEX = "index"
+DISCOVERY_CALENDAR = "calendar"
+DISCOVERY_NONE = "none"
+
 @dataclass
 class Division:
     division: int
     url: str
     output_file: str
+    folder: str
     
 divisions = [
     Division(
         division = 1, 
         url = "https://www.courts.wa.gov/appellate_trial_courts/appellatedockets/index.cfm?fa=appellatedockets.showDocket&folder=a01&year=",
         output_file = "division_1_panel_info.tsv",
+        folder = "a01",
      ),
     Division(
         division = 2,
         url = "https://www.courts.wa.gov/appellate_trial_courts/appellatedockets/index.cfm?fa=appellatedockets.showDocket&folder=a02&year=",
         output_file = "division_2_panel_info.tsv",
+        folder = "a02",
     ),
     Division(
         division = 3,
         url = "https://www.courts.wa.gov/appellate_trial_courts/appellatedockets/index.cfm?fa=appellatedockets.showDocket&folder=a03&year=",
         output_file = "division_3_panel_info.tsv",
+        folder = "a03",
     ),
 ]
 
@@ -127,6 +155,23 @@ def process_page(index: int, elements: list, argument_date: str, panel: list[str
 
     return cases
 
+def table_rows(el) -> list[list[str]]:
+    """
+        Returns the text of the <td> cells, row by row, of the table that contains the element. Works for both
+        a Selenium WebElement and a PageElement parsed from the page source. For a WebElement, every .text
+        and find_element(s) below is a round-trip to chromedriver.
+    """
+    if isinstance(el, PageElement):
+        return el.table.rows if el.table is not None else []
+
+    # Use XPath to find the parent table of this element so that
+    # the code can traverse the rows 
+    target_table = el.find_element(By.XPATH, "./ancestor::table[1]")
+    return [
+        [col.text for col in row.find_elements(By.TAG_NAME, "td")]
+        for row in target_table.find_elements(By.TAG_NAME, "tr")
+    ]
+
 def extract_litigants_attorneys(index: int, elements: list) -> tuple[list[tuple[str, str]], list[str]]:
     """
         Below is the stucture of the html that contains the litigant and attorney info. This 
@@ -182,44 +227,38 @@ def extract_litigants_attorneys(index: int, elements: list) -> tuple[list[tuple[
     litigants: list[tuple[str, str]] = [] 
     attorneys: list[str] = []
 
-    target_table = None
+    rows: list[list[str]] = []
     el = elements[index]
     text = el.text.strip()
     if text.startswith("Litigants"):
-        # Use XPath to find the parent table of this element so that
-        # the code can traverse the rows 
-        target_table = el.find_element(By.XPATH, "./ancestor::table[1]")
-
-    if target_table is not None:
-        # We have the table, loop through each row...
-        rows = target_table.find_elements(By.TAG_NAME, "tr")
-        # ...but skip the header row.
-        for row in rows[1:]:
-            cols = row.find_elements(By.TAG_NAME, "td")
-            # Every row should have 2 columns. 1st col is litigant, 2nd is attorney. If there aren't 
-            # 2 columns, something is off, just skip it.
-            if len(cols) == 2:
-                # In each row, litigant in the 1st column, attorney in the 2nd column
-                raw_litigant = cols[0].text.strip()
-                raw_attorney = cols[1].text.strip()
-                # only process non-empty (e.g. &nbsp;) litigant entries
-                if raw_litigant and raw_litigant != '\xa0' and raw_litigant != '&nbsp;':
-                    # Capture name/role if available, e.g. John Doe (Defendant). If we don't
-                    # capture both groups, put the whole string as the litigant name and set role to empty str
-                    m = re.match(r'^(.*?)\s*\((.*?)\)\s*$', raw_litigant)
-                    if m:
-                        name = m.group(1).strip()
-                        role = m.group(2).strip()
-                    else:
-                        name = raw_litigant
-                        role = ""
-                    litigants.append((name, role))
-
-                # only process non-empty attorney entries. This should not happen given my understanding of
-                # how the documents are structured, but there are thousands of pages and if it does happen 
-                # just ignore.
-                if raw_attorney and raw_attorney != '\xa0' and raw_attorney != '&nbsp;':
-                    attorneys.append(raw_attorney)
+        rows = table_rows(el)
+
+    # We have the table, loop through each row but skip the header row.
+    for cols in rows[1:]:
+        # Every row should have 2 columns. 1st col is litigant, 2nd is attorney. If there aren't 
+        # 2 columns, something is off, just skip it.
+        if len(cols) == 2:
+            # In each row, litigant in the 1st column, attorney in the 2nd column
+            raw_litigant = cols[0].strip()
+            raw_attorney = cols[1].strip()
+            # only process non-empty (e.g. &nbsp;) litigant entries
+            if raw_litigant and raw_litigant != '\xa0' and raw_litigant != '&nbsp;':
+                # Capture name/role if available, e.g. John Doe (Defendant). If we don't
+                # capture both groups, put the whole string as the litigant name and set role to empty str
+                m = re.match(r'^(.*?)\s*\((.*?)\)\s*$', raw_litigant)
+                if m:
+                    name = m.group(1).strip()
+                    role = m.group(2).strip()
+                else:
+                    name = raw_litigant
+                    role = ""
+                litigants.append((name, role))
+
+            # only process non-empty attorney entries. This should not happen given my understanding of
+            # how the documents are structured, but there are thousands of pages and if it does happen 
+            # just ignore.
+            if raw_attorney and raw_attorney != '\xa0' and raw_attorney != '&nbsp;':
+                attorneys.append(raw_attorney)
 
     return litigants, attorneys
 
@@ -309,7 +348,8 @@ def extract_date(line: str) -> str:
         line = line.split("Date: ")[1].strip()
 
     date_obj = datetime.strptime(line, "%A, %B %d, %Y").date()
-    return date_obj.strftime("%m/%d/%Y")
+    # yyyy-mm-dd, so dates in the db sort and compare in date order
+    return date_obj.isoformat()
 
 def is_panel(line: str) -> bool:
     if line[:7] == "Panel: ":
@@ -372,99 +412,342 @@ def is_no_oral_argument(line: str) -> bool:
         return True
     return False
 
-def write_cases_to_db(conn, div: int, cases: list[CaseData], argument_date: str) -> None:
+def write_cases(conn, div: int, cases: list[CaseData], argument_date: str, checkpoint: bool = True) -> bool:
+    """
+        Writes a docket day's cases and, with checkpoint, moves the division's checkpoint. Caller controls
+        the transaction.
+        Output: True if every case was written, False if some were skipped after errors
+    """
     # the logging here is to give the user validation that the program is running. 
     logging.info(f"Writing {len(cases)} cases for {cases[0].argument_date}")
-    exception_count = 0
 
-    with conn: # context manager opens a transaction and will commit/rollback automatically
-        for case in cases:
-            try:
-                insert_case_with_details(
-                    conn=conn,
-                    division=str(div),  # Convert int to str
-                    case_numbers=case.case_numbers,
-                    case_title=case.case_title,
-                    panel_date=case.argument_date,
-                    oral_arguments=case.oral_argument,
-                    judges=case.panel,
-                    litigants=case.litigants,
-                    attorneys=case.attorneys,
-                    lower_court=case.lower_court,
-                    lower_court_case_number=case.lower_court_case_number
-                )
-            except Exception as e:
-                exception_count += 1
-                first_num = case.case_numbers[0] if case.case_numbers else "UNKNOWN"
-                logging.error(
-                    f"❌ Unhandled error writing case {first_num}: {e} "
-                    f"(division {div}, date {case.argument_date})",
-                    exc_info=True
+    conn.execute("SAVEPOINT write_cases;")
+    try:
+        insert_cases_bulk(conn, str(div), cases)
+        conn.execute("RELEASE write_cases;")
+        all_written = True
+    except Exception as e:
+        # Something in the batch is bad. Redo it case by case so one bad case doesn't cost the others
+        # and the error names the case.
+        conn.execute("ROLLBACK TO write_cases;")
+        conn.execute("RELEASE write_cases;")
+        logging.warning(f"⚠️ Batch insert failed ({e}). Writing the cases one at a time.")
+        all_written = write_cases_one_by_one(conn, div, cases)
+
+    # Same transaction as the cases, so the checkpoint can never get ahead of the data. Not past a case
+    # that failed to write either, or --resume would never retry it.
+    if checkpoint and all_written:
+        update_metadata(f"last_processed_date_{div}", argument_date, conn)
+    return all_written
+
+def write_docket_day(
+    conn,
+    division: int,
+    day: str,
+    page: "DocketDay",
+    detect_changes: bool,
+    checkpoint: bool = True
+) -> bool:
+    """
+        Everything a scraped docket page puts in the db. checkpoint=False leaves the division's
+        last_processed_date where it is. Caller controls the transaction.
+        Output: True if every case on the page was written
+    """
+    all_written = True
+    if len(page.cases) > 0:
+        all_written = write_cases(conn, division, page.cases, page.argument_date, checkpoint)
+    # Teach the sitting calendar what this date looked like
+    record_docket_day(conn, division, day, len(page.cases))
+    # Only vouch for the page once all of it is in the db, otherwise the next run would skip it as
+    # unchanged and the cases that failed would never get another try
+    if detect_changes and page.content_hash is not None and all_written:
+        record_docket_page_version(conn, division, day, page.content_hash, page.etag, page.last_modified)
+    return all_written
+
+def write_cases_one_by_one(conn, div: int, cases: list[CaseData]) -> bool:
+    """
+        Writes the cases one insert_case_with_details at a time. Caller controls the transaction.
+        Output: True if every case was written, False if some were skipped after errors
+    """
+    exception_count = 0
+    for case in cases:
+        try:
+            insert_case_with_details(
+                conn=conn,
+                division=str(div),  # Convert int to str
+                case_numbers=case.case_numbers,
+                case_title=case.case_title,
+                panel_date=case.argument_date,
+                oral_arguments=case.oral_argument,
+                judges=case.panel,
+                litigants=case.litigants,
+                attorneys=case.attorneys,
+                lower_court=case.lower_court,
+                lower_court_case_number=case.lower_court_case_number
+            )
+        except Exception as e:
+            exception_count += 1
+            first_num = case.case_numbers[0] if case.case_numbers else "UNKNOWN"
+            logging.error(
+                f"❌ Unhandled error writing case {first_num}: {e} "
+                f"(division {div}, date {case.argument_date})",
+                exc_info=True
+            )
+            if exception_count > 5:
+                logging.exception(
+                    "❌ More than 5 exceptions attempting to write cases to database. Aborting batch."
                 )
-                if exception_count > 5:
-                    logging.exception(
-                        "❌ More than 5 exceptions attempting to write cases to database. Aborting batch."
-                    )
-                    raise # triggers automatic rollback
+                raise # triggers automatic rollback
+    return exception_count == 0
+
+def parse_docket(strong_elements: list) -> tuple[str | None, list[CaseData]]:
+    """
+        Input: the <strong> elements of a docket page, either Selenium WebElements or PageElements
+        Output: the argument date of the page (None if the page has no date) and the cases on it
+    """
+    argument_date: str | None = None
+    panel: list[str] = []
 
-    update_metadata(f"last_processed_date_{div}", argument_date)
+    num_lines = len(strong_elements)
 
+    if num_lines == 0: 
+        return None, []
 
-def process_cases(driver, url: str, division: int, start_dt: str, end_dt: str) -> None:
-    conn = get_connection()
-    try:
-        while date1_less_than_date2(start_dt, end_dt):
-            argument_date: str | None = None
-            cases: list[CaseData] = []
-            panel: list[str] = []
-            year = start_dt[:4]
-            full_url = url + year + "&file=" + start_dt
+    # The header section of the page gives the date and day's judicial panel before listing
+    # case details. Get that first.
+    # Note: panels can change throughout the day and such changes are noted, but that is in the case data
+    index = 0
+    while len(panel) == 0 and index < num_lines:
+        line = strong_elements[index].text.strip()
+
+        # have the content, increase index for next round, or for when we break
+        index += 1 
+
+        # argument date is first field we're interested in from the web page. read until we get it
+        if argument_date is None:
+            if is_argument_date(line):
+                argument_date = extract_date(line)
+                continue # No need for more processing on this field
+            else:
+                continue # Keep going until we get to Date for appeals argument
 
-            driver.get(full_url)
+        # panel is the next field we're interested in from the web page. read until we get it
+        if len(panel) == 0:
+            if (is_panel(line)):
+                panel = extract_panel(line)
+                break   # once we have the panel, we can break out of the while loop
+                        # to process the actual cases argued on this date
 
-            # Sadly, a dearth of id attributes in the html.
-            # All fields I want to capture are inside a strong tag. Not all fields inside a strong tag are fields I want to capture
-            strong_elements = driver.find_elements(By.TAG_NAME, "strong")
+    # Now that we have the date and the judicial panel, get the actual cases
+    if argument_date is None:  # Only process if we have a valid date
+        return None, []
 
-            num_lines = len(strong_elements)
+    return argument_date, process_page(index, strong_elements, argument_date, panel)
 
-            if num_lines == 0: 
-                start_dt = get_next_date(start_dt)
+@dataclass
+class DocketDay:
+    argument_date: str | None
+    cases: list[CaseData]
+    # Version of the page that was parsed. No hash with the webdriver parser, which never sees the html.
+    content_hash: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    # Same version as the one already ingested, so it wasn't parsed
+    unchanged: bool = False
+    # Replayed page that isn't in the page cache. We know nothing about that day, so nothing gets written.
+    missing: bool = False
+
+def scrape_docket_day(
+    fetcher,
+    url: str,
+    parser: str,
+    limiter: RateLimiter | None = None,
+    previous: tuple[str, str | None, str | None] | None = None
+) -> DocketDay:
+    """
+        Fetches and parses a single docket page. Safe to call from worker threads: the http session is
+        shared, and with selenium each call borrows its own driver from the pool.
+
+        `previous` is the (content_hash, etag, last_modified) of the version already in the db, if any.
+        When the server says the page hasn't changed, or it hashes the same, it isn't parsed at all.
+    """
+    if limiter is not None:
+        limiter.wait()
+
+    # Sadly, a dearth of id attributes in the html.
+    # All fields I want to capture are inside a strong tag. Not all fields inside a strong tag are fields I want to capture
+    if parser == PARSER_WEBDRIVER:
+        # Only possible with the selenium backend (checked in parse_args). The elements are live, so
+        # keep the driver until the page is parsed.
+        with fetcher.pool.driver() as driver:
+            driver.get(url)
+            return DocketDay(*parse_docket(driver.find_elements(By.TAG_NAME, "strong")))
+
+    prev_hash, prev_etag, prev_last_modified = previous if previous is not None else (None, None, None)
+    page = fetcher.fetch_page(url, prev_etag, prev_last_modified)
+    if page is None:
+        return DocketDay(None, [], missing=True)
+    if page.not_modified:
+        return DocketDay(None, [], prev_hash, prev_etag, prev_last_modified, unchanged=True)
+
+    content_hash = hashlib.sha256(page.html.encode("utf-8")).hexdigest()
+    if content_hash == prev_hash:
+        return DocketDay(None, [], content_hash, page.etag, page.last_modified, unchanged=True)
+
+    # One fetch for the whole page, then parse locally
+    argument_date, cases = parse_docket(parse_strong_elements(page.html))
+    return DocketDay(argument_date, cases, content_hash, page.etag, page.last_modified)
+
+def discover_docket_days(
+    fetcher,
+    conn,
+    d: Division,
+    start_dt: str,
+    end_dt: str,
+    discovery: str = DISCOVERY_INDEX,
+    limiter: RateLimiter | None = None
+) -> list[str]:
+    """
+        The dates (yyyymmdd, in order) between start_dt and end_dt for which the division's docket page is
+        worth fetching. Most calendar days (weekends, holidays, days the court doesn't sit) have no docket,
+        so fetching only the pages that exist cuts the number of requests by a lot.
+    """
+    days = date_range(start_dt, end_dt)
+    if discovery == DISCOVERY_NONE:
+        return days
+
+    known_empty = get_known_empty_docket_days(conn, d.division, start_dt, end_dt)
+
+    result = []
+    for year in sorted({day[:4] for day in days}):
+        year_days = [day for day in days if day[:4] == year]
+
+        files: set[str] = set()
+        if discovery == DISCOVERY_INDEX:
+            if limiter is not None:
+                limiter.wait()
+            # The folder/year url without a file is the index of that year's docket files
+            html = fetcher.fetch(d.url + year)
+            if html is None:
+                # Replaying and the index was never cached. Don't fall back to the sitting calendar, which
+                # may have learned from earlier replays; try every date, misses are free and aren't recorded.
+                logging.warning(
+                    f"⚠️ Docket index for division {d.division}, {year} isn't in the page cache. "
+                    f"Replaying every date."
+                )
+                result.extend(year_days)
                 continue
+            files = parse_docket_index(html, d.folder)
+            if not files:
+                logging.warning(
+                    f"⚠️ No docket files listed for division {d.division}, {year}. "
+                    f"Probing dates not known to be empty."
+                )
+
+        if files:
+            result.extend(day for day in year_days if day in files)
+        else:
+            result.extend(day for day in year_days if day not in known_empty)
+
+    logging.info(
+        f"Division {d.division}: {len(result)} of {len(days)} dates to fetch from {start_dt} to {end_dt}"
+    )
+    return result
+
+def resume_date(conn, division: int, start_dt: str) -> str:
+    """
+        The date (yyyymmdd) to resume the division from: the day after its checkpoint, or start_dt if there is
+        no checkpoint or it's before start_dt.
+    """
+    checkpoint = get_metadata(f"last_processed_date_{division}", conn)
+    if checkpoint is None:
+        return start_dt
+
+    next_dt = (parse_stored_date(checkpoint) + timedelta(days=1)).strftime("%Y%m%d")
+    if next_dt <= start_dt:
+        return start_dt
+
+    logging.info(f"Resuming division {division} from {next_dt} (checkpoint {checkpoint})")
+    return next_dt
+
+def process_cases(
+    fetcher,
+    divs: list[Division],
+    start_dt: str,
+    end_dt: str,
+    parser: str = PARSER_PAGE_SOURCE,
+    workers: int = 1,
+    limiter: RateLimiter | None = None,
+    discovery: str = DISCOVERY_INDEX,
+    detect_changes: bool = True,
+    resume: bool = False
+) -> None:
+    """
+        Scrapes the docket pages for the given divisions between the two dates. Up to `workers` pages are
+        fetched and parsed at once, but the results are handed to the db writer thread strictly in
+        division then date order so the last_processed_date_{div} checkpoint always means "everything up
+        to here is in the db".
+
+        With detect_changes, pages whose version matches the one already ingested are skipped without
+        parsing or touching the db, which is what makes refreshing a recent range cheap.
+
+        With resume, each division picks up the day after its last_processed_date_{div} checkpoint (if that
+        is later than start_dt), so a run that died part way through doesn't start over.
+    """
+    conn = get_connection()
+    try:
+        # Every (division, yyyymmdd) docket page to scrape, division by division and in date order
+        # within each division
+        days: list[tuple[Division, str]] = []
+        # The version of each page we already have, read up front so the workers don't need the db
+        versions: dict[tuple[int, str], tuple[str, str | None, str | None]] = {}
+        for d in divs:
+            div_start = resume_date(conn, d.division, start_dt) if resume else start_dt
+            for day in discover_docket_days(fetcher, conn, d, div_start, end_dt, discovery, limiter):
+                days.append((d, day))
+            if detect_changes:
+                for day, version in get_docket_page_versions(conn, d.division, div_start, end_dt).items():
+                    versions[(d.division, day)] = version
+
+        def scrape(job: tuple[Division, str]) -> DocketDay:
+            d, day = job
+            full_url = d.url + day[:4] + "&file=" + day
+            return scrape_docket_day(fetcher, full_url, parser, limiter, versions.get((d.division, day)))
+
+        current_division = None
+        unchanged = 0
+        missing = 0
+        # Divisions whose checkpoint has to stay put because a page before here was missing from the replay
+        # cache or had cases that failed to write. Moving it past that day would make a later --resume skip
+        # it. Pages are written in order on the writer's thread, so a failure holds every later page too.
+        held: set[int] = set()
+
+        def write(conn, d: Division, day: str, page: DocketDay) -> None:
+            if not write_docket_day(conn, d.division, day, page, detect_changes, d.division not in held):
+                held.add(d.division)
+
+        # Pages are written on the writer's thread while the next ones are fetched
+        with DbWriter(conn) as writer:
+            for (d, day), page in zip(days, imap_ordered(scrape, days, workers)):
+                if d.division != current_division:
+                    current_division = d.division
+                    logging.info(f"▶ Processing division {d.division} from {start_dt} to {end_dt}")
+                if page.unchanged:
+                    unchanged += 1
+                    continue
+                if page.missing:
+                    missing += 1
+                    held.add(d.division)
+                    continue
+                writer.submit(
+                    lambda conn, d=d, day=day, page=page: write(conn, d, day, page),
+                    f"division {d.division}, {day}"
+                )
 
-            # The header section of the page gives the date and day's judicial panel before listing
-            # case details. Get that first.
-            # Note: panels can change throughout the day and such changes are noted, but that is in the case data
-            index = 0
-            while len(panel) == 0 and index < num_lines:
-                line = strong_elements[index].text.strip()
-                # line = lines[index].strip()
-
-                # have the content, increase index for next round, or for when we break
-                index += 1 
-
-                # argument date is first field we're interested in from the web page. read until we get it
-                if argument_date is None:
-                    if is_argument_date(line):
-                        argument_date = extract_date(line)
-                        continue # No need for more processing on this field
-                    else:
-                        continue # Keep going until we get to Date for appeals argument
-
-                # panel is the next field we're interested in from the web page. read until we get it
-                if len(panel) == 0:
-                    if (is_panel(line)):
-                        panel = extract_panel(line)
-                        break   # once we have the panel, we can break out of the while loop
-                                # to process the actual cases argued on this date
-
-            # Now that we have the date and the judicial panel, get the actual cases
-            if argument_date is not None:  # Only process if we have a valid date
-                cases = process_page(index, strong_elements, argument_date, panel)
-                if len(cases) > 0:
-                    write_cases_to_db(conn, division, cases, argument_date)
-
-            start_dt = get_next_date(start_dt)
+        if unchanged > 0:
+            logging.info(f"Skipped {unchanged} of {len(days)} docket pages that had not changed.")
+        if missing > 0:
+            logging.warning(f"⚠️ {missing} of {len(days)} docket pages were not in the page cache and were skipped.")
     finally:
         close_connection(conn)
 
@@ -480,7 +763,10 @@ def parse_date_arg(arg_value: str) -> date:
             f"Invalid date format: '{arg_value}'. Use YYYY-MM-DD."
         )
 
-def parse_begin_end_dates(parser) -> [date, date]:
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Scrape WA appellate cases between two dates."
+    )
     parser.add_argument(
         "--start",
         required=True,
@@ -493,8 +779,66 @@ def parse_begin_end_dates(parser) -> [date, date]:
         type=parse_date_arg,
         help="End date (YYYY-MM-DD, not after last day of current year)"
     )
+    parser.add_argument(
+        "--parser",
+        choices=[PARSER_PAGE_SOURCE, PARSER_WEBDRIVER],
+        default=PARSER_PAGE_SOURCE,
+        help="Parse each page from a single page-source snapshot (default) or element by element over WebDriver"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=[BACKEND_HTTP, BACKEND_SELENIUM],
+        default=BACKEND_HTTP,
+        help="Fetch docket pages over plain http (default) or through headless Chrome"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of docket pages to fetch at once (default 1). With selenium, one Chrome per worker"
+    )
+    parser.add_argument(
+        "--max-rps",
+        type=float,
+        default=DEFAULT_MAX_RPS,
+        help=f"Politeness cap on requests per second across all workers (default {DEFAULT_MAX_RPS}, 0 for no cap)"
+    )
+    parser.add_argument(
+        "--discovery",
+        choices=[DISCOVERY_INDEX, DISCOVERY_CALENDAR, DISCOVERY_NONE],
+        default=DISCOVERY_INDEX,
+        help="How to find the docket pages worth fetching (default: read each division's year index)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't store fetched pages in the page cache under data/cache"
+    )
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help="Parse the pages stored in the page cache instead of fetching them (no network)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Parse and write every page even if it hasn't changed since it was last ingested"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Pick each division up after its last checkpoint instead of at --start"
+    )
     args = parser.parse_args()
 
+    if args.parser == PARSER_WEBDRIVER and args.backend != BACKEND_SELENIUM:
+        parser.error(f"--parser {PARSER_WEBDRIVER} requires --backend {BACKEND_SELENIUM}")
+
+    if args.parser == PARSER_WEBDRIVER and args.replay:
+        parser.error(f"--replay needs --parser {PARSER_PAGE_SOURCE}")
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
 
     begin_date = args.start
     if begin_date < MIN_DATE:
@@ -508,13 +852,11 @@ def parse_begin_end_dates(parser) -> [date, date]:
     if begin_date > end_date:
         parser.error("Begin date must be on or before end date.")
 
-    return begin_date, end_date
+    return args
 
 def main() -> None:
-    parser = argparse.ArgumentParser(
-        description="Scrape WA appellate cases between two dates."
-    )
-    begin_date, end_date = parse_begin_end_dates(parser)
+    args = parse_args()
+    begin_date, end_date = args.start, args.end
 
     start_dt = begin_date.strftime("%Y%m%d")
     end_dt = end_date.strftime("%Y%m%d")
@@ -522,17 +864,36 @@ def main() -> None:
     logging.info(f"Logging started. Writing to {log_path}")
     logging.info(f"✅ Using date range {start_dt} to {end_dt}.")
 
-    driver = create_driver()
+    if args.replay:
+        # Everything comes off the disk, so there's nobody to be polite to
+        logging.info(f"Replaying pages from the page cache with {args.workers} worker(s).")
+        fetcher = ReplayFetcher(PageCache())
+        limiter = RateLimiter(0)
+    else:
+        logging.info(
+            f"Fetching pages with the {args.backend} backend, {args.workers} worker(s), "
+            f"max {args.max_rps} requests/sec."
+        )
+        fetcher = create_fetcher(args.backend, args.workers)
+        # The webdriver parser reads live elements, there's no page source to keep
+        if not args.no_cache and args.parser == PARSER_PAGE_SOURCE:
+            fetcher = CachingFetcher(fetcher, PageCache())
+        limiter = RateLimiter(args.max_rps)
     
+    # Replayed pages are always re-parsed; that's the point of replaying
+    detect_changes = not (args.force or args.replay)
+
     try:
-        # Process per appellate division because each divisioin has a slightly different url
-        for d in divisions: 
-            logging.info(f"▶ Processing division {d.division} from {start_dt} to {end_dt}")
-            process_cases(driver, d.url, d.division, start_dt, end_dt)
+        # Each appellate division has a slightly different url. Pages from all divisions share the
+        # worker pool, but are written to the db division by division.
+        process_cases(
+            fetcher, divisions, start_dt, end_dt, args.parser, args.workers, limiter, args.discovery, detect_changes,
+            args.resume
+        )
     except Exception as e:
         logging.exception(f"❌ Unhandled error: {e}")
     finally:
-        driver.quit()
+        fetcher.close()
 
     logging.info("✅ Completed.")
 
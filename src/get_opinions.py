@@ -2,8 +2,9 @@
 
 import argparse
 import calendar
+from collections import Counter
 from dataclasses import dataclass
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 import logging
 import os
 import re
@@ -11,15 +12,27 @@ import re
 from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.support.ui import Select
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import Select, WebDriverWait
 
-from db_ops import get_connection, close_connection, update_case_opinion, insert_case_with_details 
-from driver_factory import create_driver
+from db_ops import (
+    get_connection, close_connection, apply_opinions_bulk, update_case_opinion, insert_case_with_details,
+    OPINION_INSERTED, OPINION_UPDATED,
+    record_opinions_month, get_scraped_opinion_months, record_opinion_volume, get_opinion_volumes
+)
+from date_utils import parse_release_date, parse_stored_date
+from db_writer import DbWriter
+from driver_factory import DriverPool
+from fetchers import BACKEND_HTTP, BACKEND_SELENIUM, HttpFetcher
+from page_cache import PageCache
+from page_parser import HtmlForm, parse_form, parse_opinion_tables
+from parallel import DEFAULT_MAX_RPS, RateLimiter, imap_ordered
 
 # This program loops through the Washington State Court of Appeals Opinions Release page, which is shown
-# in the global variable opinions_url. That page seems to be limited to showing 200 results, so this
-# program structures searches on the month boundary. To date, I have never seen a month with more than
-# 170 opinion releases. 
+# in the global variable opinions_url. That page is limited to showing 200 results. Searches start from
+# windows sized by how many opinions each month had the last time we looked (a quarter at once in quiet
+# stretches, part of a month in busy ones), and any search that comes back with 200 results is split in
+# half and searched again until every piece is under the cap.
 #
 # It is expected that the appellate court scheduling program has been run prior to running this program
 # and that all cases referred to in the opinion release pages have already been scraped from the schedules
@@ -35,6 +48,57 @@ from driver_factory import create_driver
 
 MIN_DATE = date(2013, 1, 1)
 
+# How the selenium backend reads a result page: one script run in the browser that hands back every row
+# (script), parsing a snapshot of the page source locally (page-source), or walking the page element by
+# element over WebDriver (webdriver, the original and by far the slowest)
+PARSER_SCRIPT = "script"
+PARSER_PAGE_SOURCE = "page-source"
+PARSER_WEBDRIVER = "webdriver"
+
+# Same walk as get_opinions_from_driver, run inside the browser. Returns [] when the search matched nothing,
+# null when there's no results heading, otherwise a [table heading, [cell texts]] pair per data row.
+EXTRACT_OPINION_ROWS_JS = """
+const xpath = (expr, context) => {
+    const result = document.evaluate(expr, context, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const nodes = [];
+    for (let i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+    return nodes;
+};
+if (xpath("//*[contains(text(), 'No opinions matched the entered search criteria')]", document).length) {
+    return [];
+}
+const h3 = xpath("//h3[contains(text(), 'Court of Appeals Opinions')]", document)[0];
+if (!h3) {
+    return null;
+}
+const rows = [];
+for (const p of xpath("following-sibling::p[strong]", h3)) {
+    const heading = xpath(".//strong", p)[0].innerText.trim();
+    const table = xpath("following-sibling::table[1]", p)[0];
+    if (!table) {
+        continue;
+    }
+    for (const tr of xpath(".//tr[position() > 1]", table)) {
+        rows.push([heading, Array.from(tr.getElementsByTagName("td"), td => td.innerText.trim())]);
+    }
+}
+return rows;
+"""
+
+# How long to wait, in seconds, for the search result page to show either its results heading or its
+# "No opinions matched" text after submitting the search
+RESULT_PAGE_TIMEOUT = 30
+RESULTS_HEADING_XPATH = "//h3[contains(text(), 'Court of Appeals Opinions')]"
+NO_MATCHES_XPATH = "//*[contains(text(), 'No opinions matched the entered search criteria')]"
+
+# The search result page never shows more than this many opinions
+OPINION_RESULT_CAP = 200
+# Months are merged into one search window while their remembered volume adds up to no more than this,
+# leaving headroom under the cap for months that turn out busier than last time
+WINDOW_TARGET = 120
+# ...and a month remembered this close to the cap is split up front rather than bisected after the fact
+SPLIT_THRESHOLD = 180
+
 opinions_url = "https://www.courts.wa.gov/opinions/" 
 
 # Create a logs directory
@@ -59,63 +123,258 @@ class Opinion:
     case_number: str
     case_title: str
     division: str
-    opinion_date: str
+    # yyyy-mm-dd, or None when the release page's date couldn't be read
+    opinion_date: str | None
     opinion_type: str
 
-def update_opinions_in_db(opinions: list[Opinion], begin_dt: str, end_dt: str) -> None:
-    if len(opinions) > 199:
-        logging.warning(f"⚠️ Warning! 200 opinions this month and website only returns 200 max. May be missing opinions.")
-    else:
-        logging.info(f"Updating opinions for {len(opinions)} cases for period {begin_dt} to {end_dt}")
-    exception_count = 0
+def write_opinions(
+    conn,
+    opinions: list[Opinion],
+    begin_dt: str,
+    end_dt: str,
+    volumes: dict[tuple[int, int], int] | None = None,
+    held_months: set[tuple[int, int]] | None = None
+) -> None:
+    """
+        Writes a search window's opinions and checkpoints the months it completes. volumes, if given, is the
+        number of opinions in each of those months, remembered so the next run can size its windows.
+        Months in held_months (e.g. ones a replay had no cached search for) are never checkpointed, and when
+        some opinions fail to write, the window's months are added to it so a --resume retries them. Caller
+        controls the transaction.
+    """
+    logging.info(f"Updating opinions for {len(opinions)} cases for period {begin_dt} to {end_dt}")
+    conn.execute("SAVEPOINT write_opinions;")
+    try:
+        outcomes = apply_opinions_bulk(conn, opinions)
+        conn.execute("RELEASE write_opinions;")
+    except Exception as e:
+        # Something in the batch is bad. Redo it opinion by opinion so one bad opinion doesn't cost the
+        # whole window and the error names the case.
+        conn.execute("ROLLBACK TO write_opinions;")
+        conn.execute("RELEASE write_opinions;")
+        logging.warning(f"⚠️ Bulk opinion update failed ({e}). Writing the opinions one at a time.")
+        outcomes = write_opinions_one_by_one(conn, opinions)
+
+    # I found some instances, espicially in cases over a decade ago, in which there are cases in the
+    # opinions release pages for which we never found a consideration date. Example: 673688, division 1.
+    # A case with incomplete information is better than not having it at all, so those get inserted.
+    for op, outcome in zip(opinions, outcomes):
+        if outcome == OPINION_INSERTED:
+            logging.info(
+                f"ℹ️ No matching case found for opinion update: "
+                f"{op.case_number} ({op.opinion_date}, {op.opinion_type}) "
+                f"Inserted as new case with incomplete information."
+            )
 
-    conn = get_connection()
+    if any(outcome is None for outcome in outcomes):
+        logging.warning(f"⚠️ Some opinions for {begin_dt} to {end_dt} were not written. Not checkpointing its months.")
+        if held_months is not None:
+            held_months.update(window_months(begin_dt, end_dt))
+        return
 
-    with conn:  # automatic transaction
-        for op in opinions:
-            try:
-                updated = update_case_opinion(conn, op.case_number, op.opinion_date, op.opinion_type)
-                if not updated:
-                    logging.info(
-                        f"ℹ️ No matching case found for opinion update: "
-                        f"{op.case_number} ({op.opinion_date}, {op.opinion_type}) "
-                        f"Inserting as new case with incomplete information."
-                    )
-                    # I found some instances, espicially in cases over a decade ago, in which there are
-                    # cases in the opinions release pages for which we never found a consideration date. 
-                    # Example: 673688, division 1. A case with incomplete information is better than not 
-                    # having it at all, so insert it.
-                    insert_case_with_details(
-                        conn=conn,
-                        division=op.division,
-                        case_numbers=[(op.case_number,False)],
-                        case_title=op.case_title,
-                        panel_date="",
-                        oral_arguments=False,
-                        judges=[],
-                        litigants=[],
-                        attorneys=[],
-                        lower_court="",
-                        lower_court_case_number=""
-                    )
-            except Exception as e:
-                exception_count += 1
-                logging.error(
-                    f"❌ Error updating opinion for case {op.case_number} "
-                    f"({op.opinion_date}, {op.opinion_type}): {e}",
-                    exc_info=True
+    # Checkpoint the months this window finishes in the same transaction as the opinions themselves. A
+    # month's volume is only remembered along with its checkpoint: a month we didn't see all of would be
+    # remembered as quieter than it was, and the planner would merge it into a window that's too wide.
+    for year, month in completed_months(begin_dt, end_dt):
+        if held_months and (year, month) in held_months:
+            continue
+        record_opinions_month(conn, year, month)
+        if volumes is not None and (year, month) in volumes:
+            record_opinion_volume(conn, year, month, volumes[(year, month)])
+
+def write_opinions_one_by_one(conn, opinions: list[Opinion]) -> list[str | None]:
+    """
+        Writes the opinions one update_case_opinion at a time. Caller controls the transaction.
+        Output: OPINION_UPDATED or OPINION_INSERTED for each opinion, None for one that failed
+    """
+    outcomes: list[str | None] = []
+    exception_count = 0
+    for op in opinions:
+        try:
+            if update_case_opinion(conn, op.case_number, op.opinion_date, op.opinion_type):
+                outcomes.append(OPINION_UPDATED)
+            else:
+                insert_case_with_details(
+                    conn=conn,
+                    division=op.division,
+                    case_numbers=[(op.case_number, False)],
+                    case_title=op.case_title,
+                    panel_date="",
+                    oral_arguments=False,
+                    judges=[],
+                    litigants=[],
+                    attorneys=[],
+                    opinion_date=op.opinion_date,
+                    opinion_publication_status=op.opinion_type,
+                    lower_court="",
+                    lower_court_case_number=""
                 )
-                if exception_count > 5:
-                    logging.exception(
-                        "❌ More than 5 exceptions while updating opinions. Aborting."
-                    )
-                    raise  # triggers automatic rollback
+                outcomes.append(OPINION_INSERTED)
+        except Exception as e:
+            exception_count += 1
+            outcomes.append(None)
+            logging.error(
+                f"❌ Error updating opinion for case {op.case_number} "
+                f"({op.opinion_date}, {op.opinion_type}): {e}",
+                exc_info=True
+            )
+            if exception_count > 5:
+                logging.exception("❌ More than 5 exceptions while updating opinions. Aborting.")
+                raise  # the caller rolls back
+    return outcomes
 
-    close_connection(conn)
+def window_months(begin_dt: str, end_dt: str) -> list[tuple[int, int]]:
+    """
+        Input: begin and end dates of a search window in mm/dd/yyyy format
+        Output: (year, month) of every month the window touches
+    """
+    begin = datetime.strptime(begin_dt, "%m/%d/%Y").date()
+    end = datetime.strptime(end_dt, "%m/%d/%Y").date()
+    months = []
+    year, month = begin.year, begin.month
+    while (year, month) <= (end.year, end.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+def count_by_month(opinions: list[Opinion]) -> Counter:
+    """(year, month) -> number of opinions released that month"""
+    counts: Counter = Counter()
+    for op in opinions:
+        if op.opinion_date is None:
+            continue
+        try:
+            d = parse_stored_date(op.opinion_date)
+        except ValueError:
+            continue
+        counts[(d.year, d.month)] += 1
+    return counts
 
-def get_opinions_for_date_range(driver: WebDriver, begin_dt: str, end_dt: str) -> None:
-    results: list[Opinion] = []
+def completed_months(begin_dt: str, end_dt: str) -> list[tuple[int, int]]:
+    """
+        (year, month) of every month whose last day falls inside the window and is already behind us.
+        Windows are searched in date order, so once the window holding a month's last day is written, the
+        whole month is. The current month (and any later one) can still get opinions, so it never counts,
+        the same way a docket day is only known empty once it was checked after the fact.
+    """
+    end = datetime.strptime(end_dt, "%m/%d/%Y").date()
+    today = date.today()
+    result = []
+    for year, month in window_months(begin_dt, end_dt):
+        last_day = date(year, month, calendar.monthrange(year, month)[1])
+        if last_day <= end and last_day < today:
+            result.append((year, month))
+    return result
 
+def opinion_from_cells(opinion_type: str, cells: list[str]) -> Opinion | None:
+    """
+        Input: the heading of the result table the row is in and the text of the row's first 4 cells
+               (file date, case number, division, case title)
+        Output: the Opinion, or None for a repeated header row
+    """
+    filing_date = cells[0]
+    # If it is the header row, continue
+    if filing_date == "File Date":
+        return None
+
+    case_info = cells[1]
+    division = cells[2]
+    case_title = cells[3]
+
+    try:
+        # Parse the date string (e.g. "Jan. 25, 2025") and convert to yyyy-mm-dd
+        file_date = parse_release_date(filing_date).isoformat()
+    except ValueError:
+        # Dates are stored as yyyy-mm-dd and nothing else, so a date we can't read is left empty
+        logging.warning(f"⚠️ Error parsing date for {filing_date} (case {cells[1].strip()}). Storing no opinion date.")
+        file_date = None
+        
+    if opinion_type == "Opinions Published in Part":
+        opinion_type_text = "Published in Part"
+    elif opinion_type == "Published Opinions":
+        opinion_type_text = "Published"
+    elif opinion_type == "Unpublished Opinions":
+        opinion_type_text = "Unpublished"
+    else:
+        opinion_type_text = opinion_type
+
+    # just the digits, please
+    case_num = re.sub(r"\D", "", case_info.rstrip())
+    appellate_div = division.rstrip()
+    # Decimal, not Roman, thank you.
+    if appellate_div == "I":
+        appellate_div = "1"
+    elif appellate_div == "II":
+        appellate_div = "2"
+    elif appellate_div == "III":
+        appellate_div = "3"
+
+    return Opinion(
+        case_number=case_num, 
+        case_title=case_title,
+        division=appellate_div,
+        opinion_date=file_date, 
+        opinion_type=opinion_type_text
+    )
+
+def search_params(begin_dt: str, end_dt: str) -> dict[str, str]:
+    # What identifies an opinions search in the page cache
+    return {"courtLevel": "Court of Appeals Only", "beginDate": begin_dt, "endDate": end_dt}
+
+def get_opinions_from_html(html: str, begin_dt: str, end_dt: str, replay: bool = False) -> list[Opinion]:
+    """
+        Builds the Opinion list from the html of a search result page, e.g. one replayed from the page cache.
+        Same result as walking the page with get_opinions_from_driver.
+    """
+    return opinions_from_rows(parse_opinion_tables(html), begin_dt, end_dt, replay)
+
+def get_opinions_from_script(driver: WebDriver, begin_dt: str, end_dt: str) -> list[Opinion]:
+    """
+        Builds the Opinion list from the search result page currently loaded in the driver with a single
+        execute_script call, instead of several WebDriver round-trips per row.
+    """
+    return opinions_from_rows(driver.execute_script(EXTRACT_OPINION_ROWS_JS), begin_dt, end_dt)
+
+def opinions_from_rows(
+    rows: list[tuple[str, list[str]]] | None,
+    begin_dt: str,
+    end_dt: str,
+    replay: bool = False
+) -> list[Opinion]:
+    """
+        Input: (table heading, cell texts) for each data row of a result page; [] if the search matched
+               nothing, None if it wasn't a result page
+        Output: the Opinions. A page that isn't a result page raises on a live search, since treating it as
+                empty would checkpoint its months with nothing in them; a replayed one is only warned about.
+    """
+    if rows is None:
+        if not replay:
+            raise RuntimeError(f"Not an opinions result page for {begin_dt} to {end_dt}")
+        logging.warning(f"⚠️ Not an opinions result page for {begin_dt} to {end_dt}")
+        return []
+    if len(rows) == 0:
+        logging.info(f"ℹ️ No opinions for the time period {begin_dt} to {end_dt}")
+        return []
+
+    results: list[Opinion] = []
+    for opinion_type, cells in rows:
+        if len(cells) >= 5: # Ensure the right number of columns exist
+            opinion = opinion_from_cells(opinion_type, cells[:4])
+            if opinion is not None:
+                results.append(opinion)
+    return results
+
+def get_opinions_for_date_range(
+    driver: WebDriver,
+    begin_dt: str,
+    end_dt: str,
+    cache: PageCache | None = None,
+    parser: str = PARSER_SCRIPT
+) -> list[Opinion]:
+    """
+        Searches the opinions release page for the date range and returns the opinions found. Writing them
+        to the db is left to the caller so searches can run on several drivers at once.
+    """
     driver.get(opinions_url)
 
     # The WA COA opinions release page require that you search based on start
@@ -134,22 +393,84 @@ def get_opinions_for_date_range(driver: WebDriver, begin_dt: str, end_dt: str) -
     search_button = driver.find_element(By.CSS_SELECTOR, "input[type='submit']")
     search_button.click()
 
-    driver.implicitly_wait(1)
+    # implicitly_wait only covers find_element, not the script and page source parsers, so wait for the
+    # result page to actually show up before reading it. Times out (and raises) if it never does.
+    WebDriverWait(driver, RESULT_PAGE_TIMEOUT).until(EC.any_of(
+        EC.presence_of_element_located((By.XPATH, RESULTS_HEADING_XPATH)),
+        EC.presence_of_element_located((By.XPATH, NO_MATCHES_XPATH))
+    ))
+
+    html = None
+    if cache is not None or parser == PARSER_PAGE_SOURCE:
+        html = driver.page_source
+    if cache is not None:
+        cache.put(opinions_url, html, search_params(begin_dt, end_dt))
+
+    if parser == PARSER_PAGE_SOURCE:
+        return get_opinions_from_html(html, begin_dt, end_dt)
+    if parser == PARSER_WEBDRIVER:
+        return get_opinions_from_driver(driver, begin_dt, end_dt)
+    return get_opinions_from_script(driver, begin_dt, end_dt)
+
+def load_search_form(fetcher: HttpFetcher) -> HtmlForm:
+    """
+        Fetches the opinions release page and reads its search form: where it submits to, how, and the
+        fields a browser would send along with the ones we fill in.
+    """
+    form = parse_form(fetcher.fetch(opinions_url), opinions_url, "beginDate")
+    if form is None:
+        raise RuntimeError(f"No opinions search form found on {opinions_url}")
+    form.select_by_visible_text("courtLevel", "Court of Appeals Only")
+    return form
+
+def get_opinions_over_http(
+    fetcher: HttpFetcher,
+    form: HtmlForm,
+    begin_dt: str,
+    end_dt: str,
+    cache: PageCache | None = None
+) -> list[Opinion]:
+    """
+        Same search as get_opinions_for_date_range, but submits the form straight to the website over the
+        fetcher's pooled session: no browser, no typing into the form and no waiting for the page to render.
+    """
+    data = dict(form.fields)
+    data["beginDate"] = begin_dt
+    data["endDate"] = end_dt
+    html = fetcher.submit(form.action, form.method, data)
+
+    # An error or maintenance page must not be cached or read as "no opinions": raising here keeps the
+    # window's months from being checkpointed, so the next run searches them again
+    rows = parse_opinion_tables(html)
+    if rows is None:
+        raise RuntimeError(f"Not an opinions result page for {begin_dt} to {end_dt}")
+
+    if cache is not None:
+        cache.put(opinions_url, html, search_params(begin_dt, end_dt))
+
+    return opinions_from_rows(rows, begin_dt, end_dt)
+
+def get_opinions_from_driver(driver: WebDriver, begin_dt: str, end_dt: str) -> list[Opinion]:
+    """
+        Builds the Opinion list from the search result page currently loaded in the driver, walking the
+        page element by element over WebDriver.
+    """
+    results: list[Opinion] = []
 
     # Sadly, there are no ids or other elements that make it easy to grab the information
     # desired. Must use XPATH.
 
     # First, it is possible no search results were returned. Let's check for the first.
     try:
-        element = driver.find_element(By.XPATH, "//*[contains(text(), 'No opinions matched the entered search criteria')]")
+        element = driver.find_element(By.XPATH, NO_MATCHES_XPATH)
         # There is text telling us there were no opinions for this date range. Log it and move on
         logging.info(f"ℹ️ No opinions for the time period {begin_dt} to {end_dt}")
-        return
+        return results
     except NoSuchElementException:
         # do nothing, just continue
         pass
 
-    h3_element = driver.find_element(By.XPATH, "//h3[contains(text(), 'Court of Appeals Opinions')]")
+    h3_element = driver.find_element(By.XPATH, RESULTS_HEADING_XPATH)
 
     # The webpage normally has 3 tables, in the following order: Opinions Published in Part,
     # Published Opinions, and Unpublished Opinions. There are no identifiers in the html to 
@@ -177,81 +498,142 @@ def get_opinions_for_date_range(driver: WebDriver, begin_dt: str, end_dt: str) -
         for row in rows:
             cells = row.find_elements(By.TAG_NAME, "td")
             if len(cells) >= 5: # Ensure the right number of columns exist
-                filing_date = cells[0].text
-                # If it is the header row, continue
-                if filing_date == "File Date":
-                    continue
+                opinion = opinion_from_cells(opinion_type, [cell.text for cell in cells[:4]])
+                if opinion is not None:
+                    results.append(opinion)
 
-                case_info = cells[1].text
-                division = cells[2].text
-                case_title = cells[3].text
-
-                try:
-                    # Parse the date string (handles "Jan. 25, 2025" format) and convert to mm/dd/yyyy
-                    parsed_date = datetime.strptime(filing_date, "%b. %d, %Y")
-                    file_date = parsed_date.strftime("%m/%d/%Y")
-                except ValueError:
-                    # Keep original date string if parsing fails
-                    logging.error(f"Error parsing date for {filing_date}")
-                    pass
-                    
-                if opinion_type == "Opinions Published in Part":
-                    opinion_type_text = "Published in Part"
-                elif opinion_type == "Published Opinions":
-                    opinion_type_text = "Published"
-                elif opinion_type == "Unpublished Opinions":
-                    opinion_type_text = "Unpublished"
-
-                # just the digits, please
-                case_num = re.sub(r"\D", "", case_info.rstrip())
-                appellate_div = division.rstrip()
-                # Decimal, not Roman, thank you.
-                if appellate_div == "I":
-                    appellate_div = "1"
-                elif appellate_div == "II":
-                    appellate_div = "2"
-                elif appellate_div == "III":
-                    appellate_div = "3"
-
-                results.append(
-                    Opinion(
-                        case_number=case_num, 
-                        case_title=case_title,
-                        division=appellate_div,
-                        opinion_date=file_date, 
-                        opinion_type=opinion_type_text
-                    )
-                )
+    return results
 
-    update_opinions_in_db(results, begin_dt, end_dt)
+def make_window(begin: date, end: date) -> dict[str, str]:
+    return {"begin": begin.strftime("%m/%d/%Y"), "end": end.strftime("%m/%d/%Y")}
 
-def generate_date_range_for_year(year: int) -> list[dict[str, str]]:
+def plan_search_windows(year: int, volumes: dict[int, int]) -> list[dict[str, str]]:
     """
-        Input: a year 
-        Output: a list with an entry for each month that contains the first day
-                of the month and last day of the month in mm/dd/yyyy format
+        Input: a year and the remembered number of opinions for each month of it (month -> count; months
+               never scraped are missing)
+        Output: search windows covering the year in date order, each with begin and end in mm/dd/yyyy format
 
-        NOTE: After running for 2013 through 2025 in late July 2025, I found a single 
-        month--April 2020--has 200 opinions. Since the site will only display up to 200, there may have been
-        more. I hard-coded a special case for April 2020.
+        Consecutive months are merged into one window while their volumes add up to no more than
+        WINDOW_TARGET. A month we know nothing about gets a window of its own, and a month remembered near
+        the 200 result cap is split into equal parts up front. Either way search_window bisects any window
+        that still comes back full, so the plan only has to be a good guess.
+
+        Replaces the one-off split of April 2020 (the only month seen at 200 so far), which now falls out
+        of its remembered volume.
     """
     result = []
+    pending_begin: date | None = None
+    pending_end: date | None = None
+    pending_count = 0
+
+    def flush() -> None:
+        nonlocal pending_begin, pending_count
+        if pending_begin is not None:
+            result.append(make_window(pending_begin, pending_end))
+        pending_begin = None
+        pending_count = 0
+
     for month in range(1, 13):
-        _, last_day = calendar.monthrange(year, month)
-        if year == 2020 and month == 4:
-            begin_str = f"{month:02d}/01/{year}"
-            end_str = f"{month:02d}/15/{year}"
-            result.append({"begin": begin_str, "end": end_str})
-            begin_str = f"{month:02d}/16/{year}"
-            end_str = f"{month:02d}/30/{year}"
-            result.append({"begin": begin_str, "end": end_str})
-        else:
-            begin_str = f"{month:02d}/01/{year}"
-            end_str = f"{month:02d}/{last_day:02d}/{year}"
-            result.append({"begin": begin_str, "end": end_str})
-    
+        first = date(year, month, 1)
+        last = date(year, month, calendar.monthrange(year, month)[1])
+        count = volumes.get(month)
+
+        if count is None or count > WINDOW_TARGET:
+            flush()
+            parts = 1 if count is None or count < SPLIT_THRESHOLD else -(-count // WINDOW_TARGET)
+            days = (last - first).days + 1
+            for i in range(parts):
+                begin = first + timedelta(days=days * i // parts)
+                end = first + timedelta(days=days * (i + 1) // parts - 1)
+                result.append(make_window(begin, end))
+            continue
+
+        if pending_begin is not None and pending_count + count > WINDOW_TARGET:
+            flush()
+        if pending_begin is None:
+            pending_begin = first
+        pending_end = last
+        pending_count += count
+    flush()
+
     return result
 
+def search_window(
+    search,
+    begin_dt: str,
+    end_dt: str,
+    missed: set[tuple[int, int]] | None = None
+) -> list[Opinion]:
+    """
+        Runs search(begin_dt, end_dt) and, whenever it comes back with OPINION_RESULT_CAP results (so some
+        may be missing), splits the window in half and searches each half instead, recursively. search
+        returns None for a window it has no answer for (replaying a window that was never fetched), in
+        which case a window spanning several months is tried month by month, and the (year, month) of any
+        part still without an answer is added to missed.
+    """
+    opinions = search(begin_dt, end_dt)
+    begin = datetime.strptime(begin_dt, "%m/%d/%Y").date()
+    end = datetime.strptime(end_dt, "%m/%d/%Y").date()
+
+    if opinions is None:
+        months = window_months(begin_dt, end_dt)
+        if len(months) == 1:
+            logging.warning(f"⚠️ No results for {begin_dt} to {end_dt}. Skipping.")
+            if missed is not None:
+                missed.update(months)
+            return []
+        results: list[Opinion] = []
+        for year, month in months:
+            first = max(begin, date(year, month, 1))
+            last = min(end, date(year, month, calendar.monthrange(year, month)[1]))
+            month_window = make_window(first, last)
+            results.extend(search_window(search, month_window['begin'], month_window['end'], missed))
+        return results
+
+    if len(opinions) < OPINION_RESULT_CAP:
+        return opinions
+
+    if begin == end:
+        logging.warning(
+            f"⚠️ Warning! {len(opinions)} opinions on {begin_dt} alone and website only returns "
+            f"{OPINION_RESULT_CAP} max. May be missing opinions."
+        )
+        return opinions
+
+    middle = begin + (end - begin) // 2
+    logging.info(f"ℹ️ {begin_dt} to {end_dt} hit the {OPINION_RESULT_CAP} result cap. Splitting the window.")
+    first_half = make_window(begin, middle)
+    second_half = make_window(middle + timedelta(days=1), end)
+    return (
+        search_window(search, first_half['begin'], first_half['end'], missed) +
+        search_window(search, second_half['begin'], second_half['end'], missed)
+    )
+
+def planned_windows(year: int) -> list[dict[str, str]]:
+    conn = get_connection()
+    try:
+        volumes = get_opinion_volumes(conn, year)
+    finally:
+        close_connection(conn)
+    date_range = plan_search_windows(year, volumes)
+    logging.info(f"{len(date_range)} search windows for {year} ({len(volumes)} months of remembered volume)")
+    return date_range
+
+def remaining_windows(date_range: list[dict[str, str]], year: int) -> list[dict[str, str]]:
+    """The search windows that touch at least one month of the year not yet checkpointed in opinions_metadata."""
+    conn = get_connection()
+    try:
+        scraped = get_scraped_opinion_months(conn, year)
+    finally:
+        close_connection(conn)
+
+    remaining = [
+        window for window in date_range
+        if any(month not in scraped for _, month in window_months(window['begin'], window['end']))
+    ]
+    logging.info(f"Resuming: {len(date_range) - len(remaining)} of {len(date_range)} search windows already scraped.")
+    return remaining
+
 def parse_year(arg_value: str) -> int:
     try:
         this_year = date.today().year
@@ -266,7 +648,7 @@ def parse_year(arg_value: str) -> int:
             f"Invalid year format: '{arg_value}'. Enter year between 2012 and {this_year}."
         )
 
-def parse_args() -> int:
+def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Scrape WA appellate opinion releases for a given year."
     )
@@ -276,31 +658,150 @@ def parse_args() -> int:
         type=parse_year,
         help="Year for which to scrape opinion data (YYYY)"
     )
+    parser.add_argument(
+        "--backend",
+        choices=[BACKEND_HTTP, BACKEND_SELENIUM],
+        default=BACKEND_HTTP,
+        help="Submit the search form over plain http (default) or fill it in with Selenium/Chrome"
+    )
+    parser.add_argument(
+        "--parser",
+        choices=[PARSER_SCRIPT, PARSER_PAGE_SOURCE, PARSER_WEBDRIVER],
+        default=PARSER_SCRIPT,
+        help="How the selenium backend reads a result page (default script: one call per page)"
+    )
+    parser.add_argument(
+        "--workers", "--drivers",
+        dest="workers",
+        type=int,
+        default=1,
+        help="Number of searches running at once; with the selenium backend, the number of Chrome instances (default 1)"
+    )
+    parser.add_argument(
+        "--max-rps",
+        type=float,
+        default=DEFAULT_MAX_RPS,
+        help=f"Politeness cap on searches per second across all drivers (default {DEFAULT_MAX_RPS}, 0 for no cap)"
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't store the result pages in the page cache under data/cache"
+    )
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help=(
+            "Parse the result pages stored in the page cache instead of searching the website. Searches are "
+            "cached by their exact dates, so this only finds the windows of a run planned the same way"
+        )
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip months already recorded as scraped in opinions_metadata"
+    )
 
     args = parser.parse_args()
-    return args.year
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    return args
 
 def main() -> None:
     # Only support scraping per year. It is assumed a full db is being built out. There are practical reasons
     # for not allowing the user to auto scrape more than a year in one invocation, and practical reasons not
     # to support less. It is my compromise. Works for me. Doubt anyone else will ever use this.
-    year = parse_args()
-    date_range = generate_date_range_for_year(year)
+    args = parse_args()
+    year = args.year
+    date_range = planned_windows(year)
+    if args.resume:
+        date_range = remaining_windows(date_range, year)
+    limiter = RateLimiter(args.max_rps)
+    pool = None
+    fetcher = None
+    form = None
+    cache = None if args.no_cache and not args.replay else PageCache()
+
+    def search(begin_dt: str, end_dt: str) -> list[Opinion]:
+        limiter.wait()
+        if fetcher is not None:
+            return get_opinions_over_http(fetcher, form, begin_dt, end_dt, cache)
+        with pool.driver() as driver:
+            return get_opinions_for_date_range(driver, begin_dt, end_dt, cache, args.parser)
+
+    def replay(begin_dt: str, end_dt: str) -> list[Opinion] | None:
+        html = cache.get(opinions_url, search_params(begin_dt, end_dt))
+        if html is None:
+            return None
+        return get_opinions_from_html(html, begin_dt, end_dt, replay=True)
+
+    # Running tally of opinions per month, stored as each month's volume once it's complete
+    month_counts: Counter = Counter()
+    # Months never to checkpoint this run: part of them had no cached search to replay, or had opinions
+    # that failed to write, so a later --resume has to search them again
+    held_months: set[tuple[int, int]] = set()
+    writer = None
+
+    def write(window: dict[str, str], opinions: list[Opinion]) -> None:
+        # Written on the writer's thread while the next windows are searched
+        month_counts.update(count_by_month(opinions))
+        volumes = {
+            month: month_counts[month]
+            for month in completed_months(window['begin'], window['end'])
+            if month not in held_months
+        }
+        writer.submit(
+            lambda conn: write_opinions(conn, opinions, window['begin'], window['end'], volumes, held_months),
+            f"opinions {window['begin']} to {window['end']}"
+        )
 
     try:
-        driver = create_driver()
-        
-        # The opinions website is limited to 200 results. Thus, we query for
-        # one month at a time. Max I've seen for a month is around 150 results
-        # for date_range in opiniondates.date_groups:
-        logging.info(f"Getting opinions for {year}...")
-        # for month in date_range:
-        for month in date_range:
-            get_opinions_for_date_range(driver, month['begin'], month['end'])
+        writer = DbWriter()
+        if args.replay:
+            # Straight from disk, no browser and no network
+            logging.info(f"Replaying cached opinions for {year}...")
+            for window in date_range:
+                missed: set[tuple[int, int]] = set()
+                opinions = search_window(replay, window['begin'], window['end'], missed)
+                held_months.update(missed)
+                if missed and not opinions:
+                    # No cached answer: there's nothing to write, and "no opinions" would be a lie
+                    continue
+                write(window, opinions)
+        else:
+            # Each worker searches a different window (bisecting it if it comes back full). Results are
+            # written to the db in date order as they come back.
+            if args.backend == BACKEND_HTTP:
+                fetcher = HttpFetcher(pool_size=max(args.workers, 10))
+                limiter.wait()
+                form = load_search_form(fetcher)
+            else:
+                pool = DriverPool(args.workers)
+
+            def search_full_window(window: dict[str, str]) -> list[Opinion]:
+                return search_window(search, window['begin'], window['end'])
+
+            logging.info(f"Getting opinions for {year} over {args.backend} with {args.workers} worker(s)...")
+            for window, opinions in zip(date_range, imap_ordered(search_full_window, date_range, args.workers)):
+                write(window, opinions)
+        # Commits what's left and raises if a write failed
+        writer.close()
     except Exception as e:
         logging.exception(f"❌ Unhandled error: {e}")
     finally:
-        driver.quit()
+        if writer is not None:
+            try:
+                writer.close()
+            except Exception:
+                pass  # already logged above
+        if pool is not None:
+            pool.close()
+        if fetcher is not None:
+            fetcher.close()
+        if cache is not None:
+            cache.close()
 
     # write_opinions_to_file(results, output_filename)
     logging.info("✅ Successfully retrieved opinions.")
@@ -0,0 +1,523 @@
+import logging
+import sqlite3
+
+# Versioned schema changes for cases.db. Each migration runs once, in order, in its own transaction together
+# with the bump of the schema_version key in the metadata table, so a database is always at exactly one
+# version. New databases (tools/create_schema.py) and existing ones (db_ops.get_connection) go through the
+# same list, which makes this the one place the schema is defined.
+#
+# To change the schema, append a migration. Never edit one that has shipped; databases that already ran
+# it won't run it again.
+
+SCHEMA_VERSION_KEY = "schema_version"
+
+# After migrating, VACUUM if at least this share of the file is free pages
+VACUUM_FREE_FRACTION = 0.25
+
+def _baseline(conn: sqlite3.Connection) -> None:
+    # The original tools/create_schema.py schema plus the tables the scrapers added since. IF NOT EXISTS
+    # because databases created before migrations existed already have (some of) them.
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS cases (
+            id INTEGER PRIMARY KEY,
+            division TEXT NOT NULL,
+            case_title TEXT,
+            panel_date TEXT,
+            oral_arguments INTEGER,
+            opinion_date TEXT,
+            opinion_publication_status TEXT,
+            disposition_status TEXT DEFAULT 'normal',
+            lower_court TEXT,
+            lower_court_case_number TEXT,
+            court_level TEXT DEFAULT 'appeals',
+            scraped_at TEXT
+        );
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS case_numbers (
+            id INTEGER PRIMARY KEY,
+            case_id INTEGER NOT NULL,
+            case_number TEXT NOT NULL,
+            is_primary INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (case_id) REFERENCES cases(id) ON DELETE CASCADE,
+            UNIQUE(case_id, case_number)
+        );
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS litigants (
+            id INTEGER PRIMARY KEY,
+            case_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            role TEXT,
+            FOREIGN KEY (case_id) REFERENCES cases(id) ON DELETE CASCADE,
+            UNIQUE(case_id, name, role)
+        );
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS attorneys (
+            id INTEGER PRIMARY KEY,
+            case_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            FOREIGN KEY (case_id) REFERENCES cases(id) ON DELETE CASCADE,
+            UNIQUE(case_id, name)
+        );
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS judges (
+            id INTEGER PRIMARY KEY,
+            case_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            FOREIGN KEY (case_id) REFERENCES cases(id) ON DELETE CASCADE,
+            UNIQUE(case_id, name)
+        );
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS metadata (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS opinions_metadata (
+            year INTEGER NOT NULL,
+            month INTEGER NOT NULL,
+            scraped_at TEXT NOT NULL,
+            PRIMARY KEY (year, month)
+        );
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS docket_days (
+            division INTEGER NOT NULL,
+            docket_date TEXT NOT NULL,
+            case_count INTEGER NOT NULL,
+            checked_at TEXT NOT NULL,
+            PRIMARY KEY (division, docket_date)
+        );
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS docket_page_versions (
+            division INTEGER NOT NULL,
+            docket_date TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            etag TEXT,
+            last_modified TEXT,
+            fetched_at TEXT NOT NULL,
+            PRIMARY KEY (division, docket_date)
+        );
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS opinion_volume (
+            year INTEGER NOT NULL,
+            month INTEGER NOT NULL,
+            opinion_count INTEGER NOT NULL,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (year, month)
+        );
+    """)
+
+def _lookup_indexes(conn: sqlite3.Connection) -> None:
+    # Child rows by case are already covered by the UNIQUE(case_id, ...) constraints. These are the
+    # lookups the other way round: a case by its number (every opinion update), people by name (query_cli
+    # and the datasette canned queries, which compare names case-insensitively), and cases by date.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_case_numbers_case_number ON case_numbers(case_number);")
+    for table in ("attorneys", "litigants", "judges"):
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_name ON {table}(name);")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_name_lower ON {table}(LOWER(name));")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_cases_panel_date ON cases(panel_date);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_cases_opinion_date ON cases(opinion_date);")
+
+def _iso_dates(conn: sqlite3.Connection) -> None:
+    # Case dates used to be stored as mm/dd/yyyy text, which sorts by month first and makes range
+    # comparisons wrong across years. Rewrite them (and the schedule scraper's checkpoints) as yyyy-mm-dd.
+    # Anything that isn't a complete mm/dd/yyyy date (e.g. the empty panel_date of cases only seen on the
+    # opinions pages) is left alone.
+    us_date = "[0-9][0-9]/[0-9][0-9]/[0-9][0-9][0-9][0-9]"
+    to_iso = "substr({0}, 7, 4) || '-' || substr({0}, 1, 2) || '-' || substr({0}, 4, 2)"
+    for column in ("panel_date", "opinion_date"):
+        conn.execute(f"UPDATE cases SET {column} = {to_iso.format(column)} WHERE {column} GLOB '{us_date}';")
+    conn.execute(f"""
+        UPDATE metadata SET value = {to_iso.format('value')}
+        WHERE key LIKE 'last_processed_date_%' AND value GLOB '{us_date}';
+    """)
+
+def _case_search(conn: sqlite3.Connection) -> None:
+    # Full-text index with one row per case (rowid = cases.id): the title and the names of the litigants
+    # and attorneys, so name searches don't have to LIKE '%...%' their way through every row of the child
+    # tables. db_ops keeps it in sync as cases are written (refresh_case_search).
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS case_search USING fts5(
+            case_title,
+            litigants,
+            attorneys,
+            tokenize = 'unicode61 remove_diacritics 2'
+        );
+    """)
+    conn.execute("DELETE FROM case_search;")
+    conn.execute("""
+        INSERT INTO case_search (rowid, case_title, litigants, attorneys)
+        SELECT
+            c.id,
+            c.case_title,
+            (SELECT group_concat(name, ' ; ') FROM litigants WHERE case_id = c.id),
+            (SELECT group_concat(name, ' ; ') FROM attorneys WHERE case_id = c.id)
+        FROM cases c;
+    """)
+
+def _natural_key(conn: sqlite3.Connection) -> None:
+    # A case is identified by (court_level, division, primary case number, panel date). Without a key,
+    # re-scraping a range we already had added a second copy of every case. Fill in the new
+    # primary_case_number column, fold the copies into the oldest row, then enforce the key so the
+    # scrapers can upsert.
+    conn.execute("ALTER TABLE cases ADD COLUMN primary_case_number TEXT;")
+    # Cases inserted from the opinions pages only have a non-primary number; fall back to it
+    conn.execute("""
+        UPDATE cases SET primary_case_number = (
+            SELECT case_number FROM case_numbers
+            WHERE case_id = cases.id
+            ORDER BY is_primary DESC, id
+            LIMIT 1
+        );
+    """)
+
+    conn.execute("""
+        CREATE TEMP TABLE case_duplicates AS
+        SELECT c.id AS duplicate_id, k.keep_id
+        FROM cases c
+        JOIN (
+            SELECT court_level, division, primary_case_number, panel_date, MIN(id) AS keep_id
+            FROM cases
+            WHERE primary_case_number IS NOT NULL AND panel_date IS NOT NULL
+            GROUP BY court_level, division, primary_case_number, panel_date
+            HAVING COUNT(*) > 1
+        ) k
+          ON c.court_level IS k.court_level
+         AND c.division = k.division
+         AND c.primary_case_number = k.primary_case_number
+         AND c.panel_date = k.panel_date
+        WHERE c.id <> k.keep_id;
+    """)
+
+    # The opinion may have been recorded on any of the copies. Keep the one on the oldest row if it has
+    # one, otherwise take the newest copy's.
+    conn.execute("""
+        UPDATE cases
+        SET (opinion_date, opinion_publication_status) = (
+            SELECT d.opinion_date, d.opinion_publication_status
+            FROM case_duplicates x
+            JOIN cases d ON d.id = x.duplicate_id
+            WHERE x.keep_id = cases.id AND d.opinion_date IS NOT NULL
+            ORDER BY d.id DESC
+            LIMIT 1
+        )
+        WHERE opinion_date IS NULL
+          AND id IN (
+            SELECT x.keep_id FROM case_duplicates x
+            JOIN cases d ON d.id = x.duplicate_id
+            WHERE d.opinion_date IS NOT NULL
+          );
+    """)
+
+    # Move the copies' related rows over to the row we keep, then drop the copies
+    conn.execute("""
+        INSERT OR IGNORE INTO case_numbers (case_id, case_number, is_primary)
+        SELECT x.keep_id, t.case_number, t.is_primary
+        FROM case_numbers t JOIN case_duplicates x ON t.case_id = x.duplicate_id;
+    """)
+    # UNIQUE(case_id, name, role) doesn't stop repeats of a litigant with no role (NULLs never collide),
+    # so compare roles with NULL as '' and move each name and role over once
+    conn.execute("""
+        INSERT OR IGNORE INTO litigants (case_id, name, role)
+        SELECT x.keep_id, t.name, MAX(t.role)
+        FROM litigants t JOIN case_duplicates x ON t.case_id = x.duplicate_id
+        WHERE NOT EXISTS (
+            SELECT 1 FROM litigants k
+            WHERE k.case_id = x.keep_id AND k.name = t.name AND COALESCE(k.role, '') = COALESCE(t.role, '')
+        )
+        GROUP BY x.keep_id, t.name, COALESCE(t.role, '');
+    """)
+    for table in ("attorneys", "judges"):
+        conn.execute(f"""
+            INSERT OR IGNORE INTO {table} (case_id, name)
+            SELECT x.keep_id, t.name
+            FROM {table} t JOIN case_duplicates x ON t.case_id = x.duplicate_id;
+        """)
+    for table in ("case_numbers", "litigants", "attorneys", "judges"):
+        conn.execute(f"DELETE FROM {table} WHERE case_id IN (SELECT duplicate_id FROM case_duplicates);")
+    conn.execute("DELETE FROM case_search WHERE rowid IN (SELECT duplicate_id FROM case_duplicates);")
+    conn.execute("DELETE FROM cases WHERE id IN (SELECT duplicate_id FROM case_duplicates);")
+
+    # The kept rows may have picked up names
+    conn.execute("DELETE FROM case_search WHERE rowid IN (SELECT keep_id FROM case_duplicates);")
+    conn.execute("""
+        INSERT INTO case_search (rowid, case_title, litigants, attorneys)
+        SELECT
+            c.id,
+            c.case_title,
+            (SELECT group_concat(name, ' ; ') FROM litigants WHERE case_id = c.id),
+            (SELECT group_concat(name, ' ; ') FROM attorneys WHERE case_id = c.id)
+        FROM cases c
+        WHERE c.id IN (SELECT DISTINCT keep_id FROM case_duplicates);
+    """)
+    conn.execute("DROP TABLE case_duplicates;")
+
+    conn.execute("""
+        CREATE UNIQUE INDEX idx_cases_natural_key
+        ON cases(court_level, division, primary_case_number, panel_date);
+    """)
+
+def _people(conn: sqlite3.Connection) -> None:
+    # attorneys, judges and litigants stored the full name again on every case, so the same prosecutor's
+    # office was repeated tens of thousands of times and listing distinct names meant grouping the whole
+    # table by LOWER(name). Keep each name once in people (name_key is the lowercase name, so spellings
+    # that differ only in case are one person) and link cases to people through slim integer tables.
+    conn.execute("""
+        CREATE TABLE people (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            name_key TEXT NOT NULL UNIQUE
+        );
+    """)
+    for table in ("case_attorneys", "case_judges"):
+        conn.execute(f"""
+            CREATE TABLE {table} (
+                case_id INTEGER NOT NULL REFERENCES cases(id) ON DELETE CASCADE,
+                person_id INTEGER NOT NULL REFERENCES people(id),
+                PRIMARY KEY (case_id, person_id)
+            ) WITHOUT ROWID;
+        """)
+    conn.execute("""
+        CREATE TABLE case_litigants (
+            case_id INTEGER NOT NULL REFERENCES cases(id) ON DELETE CASCADE,
+            person_id INTEGER NOT NULL REFERENCES people(id),
+            role TEXT NOT NULL DEFAULT '',
+            PRIMARY KEY (case_id, person_id, role)
+        ) WITHOUT ROWID;
+    """)
+    # The other way round, for a person's cases and per-person counts. On a WITHOUT ROWID table these
+    # carry the primary key too, so they cover those queries on their own.
+    for table in ("case_attorneys", "case_judges", "case_litigants"):
+        conn.execute(f"CREATE INDEX idx_{table}_person ON {table}(person_id);")
+
+    # Each person gets the spelling used most often
+    conn.execute("""
+        INSERT INTO people (name, name_key)
+        SELECT name, name_key FROM (
+            SELECT name, name_key, MAX(uses)
+            FROM (
+                SELECT name, LOWER(name) AS name_key, COUNT(*) AS uses
+                FROM (
+                    SELECT name FROM attorneys
+                    UNION ALL SELECT name FROM judges
+                    UNION ALL SELECT name FROM litigants
+                )
+                GROUP BY name
+            )
+            GROUP BY name_key
+        );
+    """)
+    for table in ("attorneys", "judges"):
+        conn.execute(f"""
+            INSERT OR IGNORE INTO case_{table} (case_id, person_id)
+            SELECT t.case_id, p.id
+            FROM {table} t JOIN people p ON p.name_key = LOWER(t.name);
+        """)
+    conn.execute("""
+        INSERT OR IGNORE INTO case_litigants (case_id, person_id, role)
+        SELECT t.case_id, p.id, COALESCE(t.role, '')
+        FROM litigants t JOIN people p ON p.name_key = LOWER(t.name);
+    """)
+
+    # The old tables become views of the same shape, so existing queries (docs/sample_sql.md, anything
+    # saved in datasette) keep working
+    for table in ("attorneys", "judges", "litigants"):
+        conn.execute(f"DROP TABLE {table};")
+    for table in ("attorneys", "judges"):
+        conn.execute(f"""
+            CREATE VIEW {table} AS
+            SELECT t.case_id, p.name
+            FROM case_{table} t JOIN people p ON p.id = t.person_id;
+        """)
+    conn.execute("""
+        CREATE VIEW litigants AS
+        SELECT t.case_id, p.name, t.role
+        FROM case_litigants t JOIN people p ON p.id = t.person_id;
+    """)
+
+    # Names that differed only in case are now one spelling, so index what the link tables hold, the same
+    # way db_ops.refresh_case_search will from here on
+    conn.execute("DELETE FROM case_search;")
+    conn.execute("""
+        INSERT INTO case_search (rowid, case_title, litigants, attorneys)
+        SELECT
+            c.id,
+            c.case_title,
+            (SELECT group_concat(p.name, ' ; ')
+             FROM case_litigants t JOIN people p ON p.id = t.person_id WHERE t.case_id = c.id),
+            (SELECT group_concat(p.name, ' ; ')
+             FROM case_attorneys t JOIN people p ON p.id = t.person_id WHERE t.case_id = c.id)
+        FROM cases c;
+    """)
+
+def _case_durations(conn: sqlite3.Connection) -> None:
+    # Time from consideration (panel_date) to opinion (opinion_date), precomputed so the questions this
+    # project exists for don't mean parsing every date in cases each time. db_ops keeps these up to date
+    # as cases are written (refresh_case_durations).
+    #
+    # case_duration_facts: what each case currently counts towards. One row per case and grouping it falls
+    #   in ('all', its division, the month it was considered, each judge on the panel, and once decided its
+    #   publication status), with days NULL while the opinion is pending.
+    # case_duration_histogram: decided cases per grouping and number of days, enough to read off counts
+    #   and percentiles without touching cases.
+    # case_duration_backlog: cases per grouping still waiting for an opinion.
+    conn.execute("""
+        CREATE TABLE case_duration_facts (
+            case_id INTEGER NOT NULL REFERENCES cases(id) ON DELETE CASCADE,
+            dimension TEXT NOT NULL,
+            label TEXT NOT NULL,
+            days INTEGER,
+            PRIMARY KEY (case_id, dimension, label)
+        ) WITHOUT ROWID;
+    """)
+    conn.execute("""
+        CREATE TABLE case_duration_histogram (
+            dimension TEXT NOT NULL,
+            label TEXT NOT NULL,
+            days INTEGER NOT NULL,
+            cases INTEGER NOT NULL,
+            PRIMARY KEY (dimension, label, days)
+        ) WITHOUT ROWID;
+    """)
+    conn.execute("""
+        CREATE TABLE case_duration_backlog (
+            dimension TEXT NOT NULL,
+            label TEXT NOT NULL,
+            cases INTEGER NOT NULL,
+            PRIMARY KEY (dimension, label)
+        ) WITHOUT ROWID;
+    """)
+    # Percentiles are nearest-rank: the smallest number of days that at least that share of the decided
+    # cases in the grouping took. Filtering this view still reads the whole histogram; query_cli
+    # durations and the case-durations canned query filter on the dimension first.
+    conn.execute("""
+        CREATE VIEW case_duration_stats AS
+        WITH buckets AS (
+            SELECT dimension, label, days, cases, 0 AS pending FROM case_duration_histogram
+            UNION ALL
+            SELECT dimension, label, NULL, 0, cases FROM case_duration_backlog
+        ),
+        running AS (
+            SELECT
+                dimension, label, days, pending,
+                SUM(cases) OVER (PARTITION BY dimension, label ORDER BY days ROWS UNBOUNDED PRECEDING) AS cumulative,
+                SUM(cases) OVER (PARTITION BY dimension, label) AS decided
+            FROM buckets
+        )
+        SELECT
+            dimension,
+            label,
+            MAX(decided) AS decided,
+            MIN(CASE WHEN days IS NOT NULL AND cumulative >= 0.50 * decided THEN days END) AS median_days,
+            MIN(CASE WHEN days IS NOT NULL AND cumulative >= 0.90 * decided THEN days END) AS p90_days,
+            MIN(CASE WHEN days IS NOT NULL AND cumulative >= 0.99 * decided THEN days END) AS p99_days,
+            SUM(pending) AS pending
+        FROM running
+        GROUP BY dimension, label;
+    """)
+
+    # Cases with a usable panel date, and the days to their opinion if it's out. A case whose opinion
+    # date is unparsable or before its panel date can't be measured and is left out.
+    iso_date = "[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]"
+    conn.execute(f"""
+        WITH c AS (
+            SELECT
+                id,
+                division,
+                substr(panel_date, 1, 7) AS month,
+                COALESCE(NULLIF(opinion_publication_status, ''), 'unknown') AS status,
+                CAST(julianday(opinion_date) - julianday(panel_date) AS INTEGER) AS days
+            FROM cases
+            WHERE panel_date GLOB '{iso_date}'
+              AND (opinion_date IS NULL OR (opinion_date GLOB '{iso_date}' AND opinion_date >= panel_date))
+        )
+        INSERT INTO case_duration_facts (case_id, dimension, label, days)
+        SELECT id, 'all', '', days FROM c
+        UNION ALL SELECT id, 'division', division, days FROM c
+        UNION ALL SELECT id, 'month', month, days FROM c
+        UNION ALL SELECT id, 'publication_status', status, days FROM c WHERE days IS NOT NULL
+        UNION ALL
+        SELECT c.id, 'judge', p.name, c.days
+        FROM c JOIN case_judges j ON j.case_id = c.id JOIN people p ON p.id = j.person_id;
+    """)
+    conn.execute("""
+        INSERT INTO case_duration_histogram (dimension, label, days, cases)
+        SELECT dimension, label, days, COUNT(*)
+        FROM case_duration_facts
+        WHERE days IS NOT NULL
+        GROUP BY dimension, label, days;
+    """)
+    conn.execute("""
+        INSERT INTO case_duration_backlog (dimension, label, cases)
+        SELECT dimension, label, COUNT(*)
+        FROM case_duration_facts
+        WHERE days IS NULL
+        GROUP BY dimension, label;
+    """)
+
+# (version, description, function applying it). Versions are consecutive, starting at 1.
+MIGRATIONS = [
+    (1, "baseline schema", _baseline),
+    (2, "lookup indexes on case numbers, names and dates", _lookup_indexes),
+    (3, "case dates as yyyy-mm-dd", _iso_dates),
+    (4, "full-text search over case titles, litigants and attorneys", _case_search),
+    (5, "natural key on cases, merging duplicate rows", _natural_key),
+    (6, "people table shared by attorneys, judges and litigants", _people),
+    (7, "case duration analytics", _case_durations),
+]
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """The version recorded in metadata; 0 for an empty database or one from before migrations."""
+    has_metadata = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'metadata'"
+    ).fetchone()
+    if not has_metadata:
+        return 0
+    row = conn.execute("SELECT value FROM metadata WHERE key = ?", (SCHEMA_VERSION_KEY,)).fetchone()
+    return int(row[0]) if row else 0
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+        Brings the database up to the latest schema version, then refreshes the query planner statistics if
+        anything changed. Safe to call on every connect: an up to date database costs a couple of queries.
+
+        Output: the schema version the database is at
+    """
+    version = get_schema_version(conn)
+    applied = False
+    for target, description, apply in MIGRATIONS:
+        if target <= version:
+            continue
+        logging.info(f"ℹ️ Migrating database to schema version {target}: {description}")
+        with conn:
+            # sqlite3 doesn't open a transaction for DDL on its own
+            if not conn.in_transaction:
+                conn.execute("BEGIN;")
+            apply(conn)
+            conn.execute("""
+                INSERT INTO metadata (key, value)
+                VALUES (?, ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value;
+            """, (SCHEMA_VERSION_KEY, str(target)))
+        version = target
+        applied = True
+
+    if applied:
+        # Without statistics the planner can't tell a selective index from a useless one
+        conn.execute("ANALYZE;")
+        # A migration that rewrote or dropped a lot (e.g. version 6) leaves the freed pages inside the
+        # file. Give them back so the database actually shrinks.
+        page_count = conn.execute("PRAGMA page_count;").fetchone()[0]
+        free_pages = conn.execute("PRAGMA freelist_count;").fetchone()[0]
+        if page_count and free_pages / page_count >= VACUUM_FREE_FRACTION:
+            logging.info(f"ℹ️ Reclaiming {free_pages} free pages of {page_count} with VACUUM")
+            conn.execute("VACUUM;")
+    return version
@@ -0,0 +1,138 @@
+from datetime import datetime
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+from fetchers import FetchedPage
+
+# On-disk cache of the raw html of every page the scrapers fetch, so that when the parsing logic changes
+# the data can be re-derived from what we already downloaded instead of scraping the court website again.
+#
+# Layout under data/cache/:
+#   objects/ab/abcdef....html.gz   gzip-compressed page bodies, named by the sha256 of the content. Identical
+#                                  pages (e.g. the many empty docket days) are stored once.
+#   index.db                       sqlite table mapping a request (url + params) to the content hash of the
+#                                  last response and when it was fetched
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, "..", "data", "cache")
+
+def request_key(url: str, params: dict[str, str] | None = None) -> str:
+    # Params are sorted so the same search always maps to the same key
+    canonical = url + "\n" + json.dumps(params or {}, sort_keys=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+class PageCache:
+    def __init__(self, cache_dir: str = CACHE_DIR) -> None:
+        self.cache_dir = cache_dir
+        self.objects_dir = os.path.join(cache_dir, "objects")
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        # Pages are fetched (and cached) from worker threads, so the index connection is shared behind a lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(cache_dir, "index.db"), check_same_thread=False)
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    params TEXT,
+                    content_hash TEXT NOT NULL,
+                    fetched_at TEXT NOT NULL
+                );
+            """)
+
+    def _object_path(self, content_hash: str) -> str:
+        return os.path.join(self.objects_dir, content_hash[:2], content_hash + ".html.gz")
+
+    def put(self, url: str, html: str, params: dict[str, str] | None = None) -> str:
+        """Store a fetched page and return its content hash."""
+        body = html.encode("utf-8")
+        content_hash = hashlib.sha256(body).hexdigest()
+
+        path = self._object_path(content_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file and rename so a crash never leaves a truncated object behind
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+
+        fetched_at = datetime.utcnow().isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            self._conn.execute("""
+                INSERT INTO pages (key, url, params, content_hash, fetched_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    content_hash = excluded.content_hash,
+                    fetched_at = excluded.fetched_at;
+            """, (request_key(url, params), url, json.dumps(params or {}, sort_keys=True), content_hash, fetched_at))
+        return content_hash
+
+    def get(self, url: str, params: dict[str, str] | None = None) -> str | None:
+        """The html last fetched for the request, or None if it was never fetched."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash FROM pages WHERE key = ?", (request_key(url, params),)
+            ).fetchone()
+        if row is None:
+            return None
+
+        path = self._object_path(row[0])
+        if not os.path.exists(path):
+            logging.warning(f"⚠️ Cache index points at missing object {row[0]} for {url}")
+            return None
+        with gzip.open(path, "rb") as f:
+            return f.read().decode("utf-8")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class CachingFetcher:
+    """Wraps a fetcher and stores every page it fetches in the cache."""
+    def __init__(self, fetcher, cache: PageCache) -> None:
+        self.fetcher = fetcher
+        self.cache = cache
+
+    def fetch(self, url: str) -> str:
+        html = self.fetcher.fetch(url)
+        self.cache.put(url, html)
+        return html
+
+    def fetch_page(self, url: str, etag: str | None = None, last_modified: str | None = None) -> FetchedPage:
+        page = self.fetcher.fetch_page(url, etag, last_modified)
+        # Nothing new to keep when the server says our copy is current
+        if not page.not_modified:
+            self.cache.put(url, page.html)
+        return page
+
+    def close(self) -> None:
+        self.fetcher.close()
+        self.cache.close()
+
+class ReplayFetcher:
+    """
+        Serves pages from the cache only. No network I/O; a page that was never fetched comes back as None,
+        so callers can tell it apart from a page that really was empty and not record anything about it.
+    """
+    def __init__(self, cache: PageCache) -> None:
+        self.cache = cache
+
+    def fetch(self, url: str) -> str | None:
+        html = self.cache.get(url)
+        if html is None:
+            logging.debug(f"Not in cache: {url}")
+        return html
+
+    def fetch_page(self, url: str, etag: str | None = None, last_modified: str | None = None) -> FetchedPage | None:
+        html = self.fetch(url)
+        return FetchedPage(html=html) if html is not None else None
+
+    def close(self) -> None:
+        self.cache.close()
@@ -0,0 +1,380 @@
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+import re
+from urllib.parse import parse_qs, urljoin, urlsplit
+
+# Parses a raw html page (e.g. driver.page_source) locally instead of asking chromedriver about each
+# element. Every WebDriver call (.text, find_element, find_elements) is an HTTP round-trip to chromedriver,
+# and a busy docket day has hundreds of <strong> elements. Parsing one snapshot of the page source in
+# process gives the same information for the price of a single round-trip.
+#
+# The objects produced here mimic the small part of the Selenium WebElement interface the docket parser
+# relies on: the visible .text of each <strong> element and the rows of the table that contains it.
+
+# Whitespace as html collapses it. Deliberately not \s, which would also match the non-breaking space.
+_HTML_WHITESPACE = re.compile(r"[ \t\n\r\f\v]+")
+# Stands in for a <br> in raw text until visible_text turns it into a line break. Newlines in the source are
+# just whitespace.
+_LINE_BREAK = "\x00"
+
+@dataclass(slots=True)
+class PageTable:
+    # Each row is a list of the text of its <td> cells
+    rows: list[list[str]] = field(default_factory=list)
+
+@dataclass(slots=True)
+class PageElement:
+    text: str
+    # Nearest enclosing table (the equivalent of XPath ./ancestor::table[1]), or None
+    table: PageTable | None = None
+
+def visible_text(raw: str) -> str:
+    """
+        Normalizes raw text the way Selenium's WebElement.text reports it: runs of whitespace collapse
+        to a single space, non-breaking spaces become spaces, and each line is trimmed. Line breaks
+        come from <br> tags only.
+    """
+    lines = []
+    for line in raw.split(_LINE_BREAK):
+        line = _HTML_WHITESPACE.sub(" ", line.replace("\xa0", " ")).strip()
+        lines.append(line)
+    return "\n".join(lines).strip()
+
+class _StrongElementParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.elements: list[PageElement] = []
+        # open <strong> elements and the text captured for each so far
+        self._strong_stack: list[tuple[PageElement, list[str]]] = []
+        # open tables, each with its currently open row and cell (if any)
+        self._table_stack: list[tuple[PageTable, list[str] | None, list[str] | None]] = []
+        self._skip_depth = 0
+
+    def _close_cell(self) -> None:
+        table, row, cell = self._table_stack[-1]
+        if cell is not None and row is not None:
+            row.append(visible_text("".join(cell)))
+        self._table_stack[-1] = (table, row, None)
+
+    def _close_row(self) -> None:
+        self._close_cell()
+        table, row, _ = self._table_stack[-1]
+        if row is not None:
+            table.rows.append(row)
+        self._table_stack[-1] = (table, None, None)
+
+    def _append_text(self, text: str) -> None:
+        for _, buf in self._strong_stack:
+            buf.append(text)
+        if self._table_stack:
+            _, _, cell = self._table_stack[-1]
+            if cell is not None:
+                cell.append(text)
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag in ("script", "style"):
+            self._skip_depth += 1
+        elif tag == "table":
+            self._table_stack.append((PageTable(), None, None))
+        elif tag == "tr" and self._table_stack:
+            # html lets the previous row/cell go unclosed
+            self._close_row()
+            table, _, _ = self._table_stack[-1]
+            self._table_stack[-1] = (table, [], None)
+        elif tag in ("td", "th") and self._table_stack:
+            self._close_cell()
+            table, row, _ = self._table_stack[-1]
+            if row is None:
+                row = []
+            # Selenium's find_elements(By.TAG_NAME, "td") only sees td cells, so th text goes nowhere
+            self._table_stack[-1] = (table, row, [] if tag == "td" else None)
+        elif tag == "br":
+            self._append_text(_LINE_BREAK)
+        elif tag == "strong":
+            table = self._table_stack[-1][0] if self._table_stack else None
+            element = PageElement(text="", table=table)
+            # appended on the start tag so nested <strong> tags stay in document order
+            self.elements.append(element)
+            self._strong_stack.append((element, []))
+
+    def handle_startendtag(self, tag: str, attrs) -> None:
+        if tag == "br":
+            self._append_text(_LINE_BREAK)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in ("script", "style"):
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == "table" and self._table_stack:
+            self._close_row()
+            self._table_stack.pop()
+        elif tag == "tr" and self._table_stack:
+            self._close_row()
+        elif tag in ("td", "th") and self._table_stack:
+            self._close_cell()
+        elif tag == "strong" and self._strong_stack:
+            element, buf = self._strong_stack.pop()
+            element.text = visible_text("".join(buf))
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_depth == 0:
+            self._append_text(data)
+
+    def close(self) -> None:
+        super().close()
+        # Anything still open at the end of the document is closed implicitly
+        while self._strong_stack:
+            self.handle_endtag("strong")
+        while self._table_stack:
+            self.handle_endtag("table")
+
+def parse_strong_elements(html: str) -> list[PageElement]:
+    """
+        Input: the html of a page
+        Output: every <strong> element on the page in document order, which is the same list
+                driver.find_elements(By.TAG_NAME, "strong") returns
+    """
+    parser = _StrongElementParser()
+    parser.feed(html)
+    parser.close()
+    return parser.elements
+
+class _LinkParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.hrefs: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag == "a":
+            for name, value in attrs:
+                if name == "href" and value:
+                    self.hrefs.append(value)
+
+def parse_docket_index(html: str, folder: str) -> set[str]:
+    """
+        Input: html of a docket folder/year index page and the folder of interest (e.g. a01)
+        Output: the file names (docket dates in yyyymmdd format) of every docket page the index links to
+    """
+    parser = _LinkParser()
+    parser.feed(html)
+    parser.close()
+
+    files: set[str] = set()
+    for href in parser.hrefs:
+        query = parse_qs(urlsplit(href).query)
+        # Links to other divisions' folders can show up in the page navigation
+        if query.get("folder", [folder])[0] != folder:
+            continue
+        for file in query.get("file", []):
+            if re.fullmatch(r"\d{8}", file):
+                files.add(file)
+    return files
+
+# Elements that never have content or an end tag
+_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+# Starting one of these closes an open <p>, the way browsers build the DOM
+_CLOSES_P = {"p", "div", "table", "h1", "h2", "h3", "h4", "h5", "h6", "ul", "ol", "form", "hr", "pre", "blockquote"}
+
+class HtmlNode:
+    """A bare-bones DOM element: tag, attributes, parent and children (text is kept as str children)."""
+    __slots__ = ("tag", "attrs", "parent", "children")
+
+    def __init__(self, tag: str, attrs: dict[str, str], parent: "HtmlNode | None") -> None:
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children: list = []
+
+    def elements(self) -> list["HtmlNode"]:
+        """Child elements, without the text."""
+        return [c for c in self.children if isinstance(c, HtmlNode)]
+
+    def iter(self, tag: str | None = None):
+        """Descendant elements (not including this one) in document order, optionally only one tag."""
+        for child in self.children:
+            if isinstance(child, HtmlNode):
+                if tag is None or child.tag == tag:
+                    yield child
+                yield from child.iter(tag)
+
+    def own_text(self) -> str:
+        """Text directly inside this element, like XPath text()."""
+        return "".join(c for c in self.children if isinstance(c, str))
+
+    def raw_text(self) -> str:
+        parts = []
+        for child in self.children:
+            if isinstance(child, str):
+                parts.append(child)
+            elif child.tag == "br":
+                parts.append(_LINE_BREAK)
+            elif child.tag not in ("script", "style"):
+                parts.append(child.raw_text())
+        return "".join(parts)
+
+    @property
+    def text(self) -> str:
+        """Visible text, normalized like Selenium's WebElement.text."""
+        return visible_text(self.raw_text())
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.root = HtmlNode("#document", {}, None)
+        self._current = self.root
+
+    def _close(self, tag: str) -> None:
+        # Close the nearest open element with this tag (and anything left open inside it)
+        node = self._current
+        while node is not None and node.tag != tag:
+            node = node.parent
+        if node is not None and node is not self.root:
+            self._current = node.parent
+
+    def _has_open_p(self) -> bool:
+        node = self._current
+        while node is not None and node.tag not in ("td", "th", "table", "#document"):
+            if node.tag == "p":
+                return True
+            node = node.parent
+        return False
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag in _CLOSES_P and self._has_open_p():
+            self._close("p")
+        # html lets rows and cells go unclosed
+        if tag == "tr":
+            for open_tag in ("td", "th", "tr"):
+                if self._current.tag == open_tag:
+                    self._close(open_tag)
+        elif tag in ("td", "th") and self._current.tag in ("td", "th"):
+            self._close(self._current.tag)
+        elif tag == "option" and self._current.tag == "option":
+            self._close("option")
+
+        node = HtmlNode(tag, {k: v or "" for k, v in attrs}, self._current)
+        self._current.children.append(node)
+        if tag not in _VOID_TAGS:
+            self._current = node
+
+    def handle_startendtag(self, tag: str, attrs) -> None:
+        node = HtmlNode(tag, {k: v or "" for k, v in attrs}, self._current)
+        self._current.children.append(node)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag not in _VOID_TAGS:
+            self._close(tag)
+
+    def handle_data(self, data: str) -> None:
+        self._current.children.append(data)
+
+def parse_html_tree(html: str) -> HtmlNode:
+    """Parse a page into a tree of HtmlNodes. Returns the document node."""
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+def parse_opinion_tables(html: str) -> list[tuple[str, list[str]]] | None:
+    """
+        Input: html of an opinions search result page
+        Output: a (table heading, cell texts) entry for every data row of the result tables, in page order.
+                Empty if the search matched nothing, None if the page doesn't look like a result page.
+
+        Mirrors the XPath walk in get_opinions_for_date_range: each <p><strong>heading</strong></p> that
+        follows the "Court of Appeals Opinions" <h3> names the first table after it, and every row but the
+        first (heading) row of that table is a data row.
+    """
+    root = parse_html_tree(html)
+
+    for node in root.iter():
+        if "No opinions matched the entered search criteria" in node.own_text():
+            return []
+
+    h3 = next((n for n in root.iter("h3") if "Court of Appeals Opinions" in n.own_text()), None)
+    if h3 is None:
+        return None
+
+    siblings = h3.parent.elements()
+    following = siblings[siblings.index(h3) + 1:]
+
+    rows: list[tuple[str, list[str]]] = []
+    for i, p in enumerate(following):
+        # p[strong], then the first <strong> inside it
+        if p.tag != "p" or not any(c.tag == "strong" for c in p.elements()):
+            continue
+        heading = next(p.iter("strong")).text.strip()
+
+        table = next((t for t in following[i + 1:] if t.tag == "table"), None)
+        if table is None:
+            continue
+
+        # .//tr[position() > 1]: every row except the first row under each parent (table or tbody)
+        for parent in [table] + list(table.iter()):
+            trs = [c for c in parent.elements() if c.tag == "tr"]
+            for tr in trs[1:]:
+                rows.append((heading, [td.text for td in tr.iter("td")]))
+
+    return rows
+
+@dataclass(slots=True)
+class HtmlForm:
+    action: str
+    method: str
+    # What the browser would submit if nobody touched the form: name -> value
+    fields: dict[str, str] = field(default_factory=dict)
+    # Each <select>'s options as (value, visible label) pairs
+    options: dict[str, list[tuple[str, str]]] = field(default_factory=dict)
+
+    def select_by_visible_text(self, name: str, label: str) -> None:
+        """Like Selenium's Select.select_by_visible_text on the named <select>."""
+        for value, text in self.options.get(name, []):
+            if text == label:
+                self.fields[name] = value
+                return
+        raise ValueError(f"No option '{label}' in select '{name}'")
+
+def parse_form(html: str, base_url: str, field_name: str) -> HtmlForm | None:
+    """
+        Input: html of a page, the url it came from, and the name of a field the wanted form has
+        Output: the first form with that field, or None
+
+        Collects the fields the way a browser submits a form on a click of its first submit button:
+        text/hidden inputs with their values, checked checkboxes and radios, the selected (or first) option
+        of each select, and the name/value of that submit button.
+    """
+    root = parse_html_tree(html)
+    for form in root.iter("form"):
+        controls = [n for n in form.iter() if n.tag in ("input", "select", "textarea") and n.attrs.get("name")]
+        if not any(n.attrs["name"] == field_name for n in controls):
+            continue
+
+        result = HtmlForm(
+            action=urljoin(base_url, form.attrs.get("action", "")),
+            method=form.attrs.get("method", "get").upper(),
+        )
+        submitted = False
+        for n in controls:
+            name = n.attrs["name"]
+            if n.tag == "select":
+                options = [(o.attrs.get("value", o.text), o.text) for o in n.iter("option")]
+                result.options[name] = options
+                selected = [o for o in n.iter("option") if "selected" in o.attrs]
+                if selected:
+                    result.fields[name] = selected[0].attrs.get("value", selected[0].text)
+                elif options:
+                    result.fields[name] = options[0][0]
+            elif n.tag == "textarea":
+                result.fields[name] = n.raw_text()
+            else:
+                input_type = n.attrs.get("type", "text").lower()
+                if input_type in ("submit", "image"):
+                    if not submitted:
+                        result.fields[name] = n.attrs.get("value", "")
+                        submitted = True
+                elif input_type in ("checkbox", "radio"):
+                    if "checked" in n.attrs:
+                        result.fields[name] = n.attrs.get("value", "on")
+                elif input_type not in ("button", "reset", "file"):
+                    result.fields[name] = n.attrs.get("value", "")
+        return result
+    return None
@@ -0,0 +1,67 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from typing import Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Helpers for fetching many pages at once without hammering the court website. The scrapers are
+# I/O bound (waiting on the network), so threads are enough; parsing a page is a few milliseconds.
+
+# Be a polite client of a public court website, even when fetching with many workers
+DEFAULT_MAX_RPS = 4.0
+
+class RateLimiter:
+    """
+        Global politeness cap shared by every worker: at most `rate` calls to wait() return per second,
+        evenly spaced. A rate of 0 (or less) means no limit.
+    """
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def wait(self) -> None:
+        if self.interval == 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+def imap_ordered(fn: Callable[[T], R], items: Iterable[T], workers: int, window: int | None = None) -> Iterator[R]:
+    """
+        Like map(fn, items), but runs up to `workers` calls at once on a thread pool. Results are
+        yielded in the order of `items` no matter which call finishes first, and at most `window`
+        calls (default 2 x workers) are in flight or waiting to be consumed, so a slow consumer
+        (e.g. the db writer) holds back fetching instead of piling up pages in memory.
+
+        With a single worker everything runs in the calling thread.
+    """
+    if workers <= 1:
+        for item in items:
+            yield fn(item)
+        return
+
+    if window is None:
+        window = workers * 2
+
+    pending = deque()
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        # On an error (or the consumer stopping early) don't start anything still queued
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
@@ -1,92 +1,18 @@
 import sqlite3
 import os
+import sys
+
+# The schema itself lives in src/migrations.py, so that existing databases can be brought up to date the
+# same way a new one is created. Running this on an existing database applies any pending migrations.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from migrations import migrate  # noqa: E402
 
 DB_FILE = "../data/cases.db"
 
 conn = sqlite3.connect(DB_FILE)
-cur = conn.cursor()
-
-cur.execute("PRAGMA foreign_keys = ON;")
-
-# ----- Core tables -----
-cur.execute("""
-CREATE TABLE IF NOT EXISTS cases (
-    id INTEGER PRIMARY KEY,
-    division TEXT NOT NULL,
-    case_title TEXT,
-    panel_date TEXT,
-    oral_arguments INTEGER,
-    opinion_date TEXT,
-    opinion_publication_status TEXT,
-    disposition_status TEXT DEFAULT 'normal',
-    lower_court TEXT,
-    lower_court_case_number TEXT,
-    court_level TEXT DEFAULT 'appeals',
-    scraped_at TEXT
-);
-""")
-
-cur.execute("""
-CREATE TABLE IF NOT EXISTS case_numbers (
-    id INTEGER PRIMARY KEY,
-    case_id INTEGER NOT NULL,
-    case_number TEXT NOT NULL,
-    is_primary INTEGER NOT NULL DEFAULT 0,
-    FOREIGN KEY (case_id) REFERENCES cases(id) ON DELETE CASCADE,
-    UNIQUE(case_id, case_number)
-);
-""")
-
-cur.execute("""
-CREATE TABLE IF NOT EXISTS litigants (
-    id INTEGER PRIMARY KEY,
-    case_id INTEGER NOT NULL,
-    name TEXT NOT NULL,
-    role TEXT,
-    FOREIGN KEY (case_id) REFERENCES cases(id) ON DELETE CASCADE,
-    UNIQUE(case_id, name, role)
-);
-""")
-
-cur.execute("""
-CREATE TABLE IF NOT EXISTS attorneys (
-    id INTEGER PRIMARY KEY,
-    case_id INTEGER NOT NULL,
-    name TEXT NOT NULL,
-    FOREIGN KEY (case_id) REFERENCES cases(id) ON DELETE CASCADE,
-    UNIQUE(case_id, name)
-);
-""")
+conn.execute("PRAGMA foreign_keys = ON;")
 
-cur.execute("""
-CREATE TABLE IF NOT EXISTS judges (
-    id INTEGER PRIMARY KEY,
-    case_id INTEGER NOT NULL,
-    name TEXT NOT NULL,
-    FOREIGN KEY (case_id) REFERENCES cases(id) ON DELETE CASCADE,
-    UNIQUE(case_id, name)
-);
-""")
+version = migrate(conn)
 
-cur.execute("""
-CREATE TABLE IF NOT EXISTS metadata (
-    key TEXT PRIMARY KEY,
-    value TEXT
-);
-""")
-
-cur.execute("""
-CREATE TABLE IF NOT EXISTS opinions_metadata (
-    year INTEGER NOT NULL,
-    month INTEGER NOT NULL,
-    scraped_at TEXT NOT NULL,
-    PRIMARY KEY (year, month)
-);
-""")
-
-conn.commit()
 conn.close()
-print(f"Database schema created in {DB_FILE}")
-
-
-
+print(f"Database schema created in {DB_FILE} (schema version {version})")
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+
+# Writes a columnar snapshot of cases.db for analysis in pandas, polars, duckdb and friends, instead of
+# running the joins in docs/sample_sql.md row by row. Each table goes to its own directory, partitioned by
+# division and year (the year of the panel date, or of the opinion date for cases only seen on the
+# opinions pages):
+#
+#   data/snapshot/cases/division=1/year=2013/part-0.arrow
+#   data/snapshot/case_numbers/...  judges/...  litigants/...  attorneys/...
+#   data/snapshot/case_details/...  one row per case with its numbers, judges, litigants and attorneys as lists
+#
+# Rows are streamed from sqlite into record batches, so memory stays flat however big the database is.
+# The default Arrow IPC files are uncompressed and can be memory-mapped; --format parquet writes
+# zstd-compressed Parquet instead.
+#
+# A run records each partition's case count and newest scraped_at (the scrapers bump scraped_at whenever
+# they write a case or its opinion). --incremental then only rewrites the partitions where either changed.
+# Run a full export after anything that changes cases without a scrape, e.g. a schema migration.
+#
+#   python tools/export_snapshot.py
+#   python tools/export_snapshot.py --incremental
+#   python tools/export_snapshot.py --format parquet --out /tmp/snapshot
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+import db_ops  # noqa: E402
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    sys.exit("❌ export_snapshot.py needs pyarrow: pip install -r requirements.txt")
+
+DEFAULT_OUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "snapshot")
+STATE_FILE = "_snapshot.json"
+FORMATS = {"arrow": "arrow", "parquet": "parquet"}  # format -> file extension
+DEFAULT_BATCH_ROWS = 50_000
+
+# Partition of every case, built once per run so each partition's queries are index lookups
+SNAPSHOT_CASES_SQL = """
+    CREATE TEMP TABLE snapshot_cases AS
+    SELECT
+        id AS case_id,
+        division,
+        CASE
+            WHEN substr(COALESCE(NULLIF(panel_date, ''), opinion_date), 1, 4) GLOB '[0-9][0-9][0-9][0-9]'
+            THEN substr(COALESCE(NULLIF(panel_date, ''), opinion_date), 1, 4)
+            ELSE 'unknown'
+        END AS year,
+        scraped_at
+    FROM cases;
+"""
+
+NAME_LIST = pa.list_(pa.string())
+
+# table -> (schema, query for one partition taking (division, year), columns holding json arrays)
+TABLES = {
+    "cases": (
+        pa.schema([
+            ("id", pa.int64()),
+            ("division", pa.string()),
+            ("case_title", pa.string()),
+            ("panel_date", pa.string()),
+            ("oral_arguments", pa.int8()),
+            ("opinion_date", pa.string()),
+            ("opinion_publication_status", pa.string()),
+            ("disposition_status", pa.string()),
+            ("lower_court", pa.string()),
+            ("lower_court_case_number", pa.string()),
+            ("court_level", pa.string()),
+            ("primary_case_number", pa.string()),
+            ("scraped_at", pa.string()),
+        ]),
+        """
+            SELECT
+                c.id, c.division, c.case_title, c.panel_date, c.oral_arguments, c.opinion_date,
+                c.opinion_publication_status, c.disposition_status, c.lower_court, c.lower_court_case_number,
+                c.court_level, c.primary_case_number, c.scraped_at
+            FROM snapshot_cases s JOIN cases c ON c.id = s.case_id
+            WHERE s.division = ? AND s.year = ?
+            ORDER BY c.id;
+        """,
+        (),
+    ),
+    "case_numbers": (
+        pa.schema([("case_id", pa.int64()), ("case_number", pa.string()), ("is_primary", pa.int8())]),
+        """
+            SELECT t.case_id, t.case_number, t.is_primary
+            FROM snapshot_cases s JOIN case_numbers t ON t.case_id = s.case_id
+            WHERE s.division = ? AND s.year = ?
+            ORDER BY t.case_id, t.id;
+        """,
+        (),
+    ),
+    "judges": (
+        pa.schema([("case_id", pa.int64()), ("name", pa.string())]),
+        """
+            SELECT t.case_id, p.name
+            FROM snapshot_cases s
+            JOIN case_judges t ON t.case_id = s.case_id
+            JOIN people p ON p.id = t.person_id
+            WHERE s.division = ? AND s.year = ?
+            ORDER BY t.case_id, p.name;
+        """,
+        (),
+    ),
+    "litigants": (
+        pa.schema([("case_id", pa.int64()), ("name", pa.string()), ("role", pa.string())]),
+        """
+            SELECT t.case_id, p.name, t.role
+            FROM snapshot_cases s
+            JOIN case_litigants t ON t.case_id = s.case_id
+            JOIN people p ON p.id = t.person_id
+            WHERE s.division = ? AND s.year = ?
+            ORDER BY t.case_id, p.name;
+        """,
+        (),
+    ),
+    "attorneys": (
+        pa.schema([("case_id", pa.int64()), ("name", pa.string())]),
+        """
+            SELECT t.case_id, p.name
+            FROM snapshot_cases s
+            JOIN case_attorneys t ON t.case_id = s.case_id
+            JOIN people p ON p.id = t.person_id
+            WHERE s.division = ? AND s.year = ?
+            ORDER BY t.case_id, p.name;
+        """,
+        (),
+    ),
+    # Denormalized: everything about a case in one row, no joins needed downstream
+    "case_details": (
+        pa.schema([
+            ("case_id", pa.int64()),
+            ("division", pa.string()),
+            ("primary_case_number", pa.string()),
+            ("case_title", pa.string()),
+            ("panel_date", pa.string()),
+            ("opinion_date", pa.string()),
+            ("days_to_opinion", pa.int32()),
+            ("opinion_publication_status", pa.string()),
+            ("oral_arguments", pa.int8()),
+            ("lower_court", pa.string()),
+            ("lower_court_case_number", pa.string()),
+            ("case_numbers", NAME_LIST),
+            ("judges", NAME_LIST),
+            ("litigants", pa.list_(pa.struct([("name", pa.string()), ("role", pa.string())]))),
+            ("attorneys", NAME_LIST),
+        ]),
+        """
+            SELECT
+                c.id,
+                c.division,
+                c.primary_case_number,
+                c.case_title,
+                c.panel_date,
+                c.opinion_date,
+                CASE WHEN c.opinion_date >= c.panel_date
+                     THEN CAST(julianday(c.opinion_date) - julianday(c.panel_date) AS INTEGER)
+                END,
+                c.opinion_publication_status,
+                c.oral_arguments,
+                c.lower_court,
+                c.lower_court_case_number,
+                (SELECT json_group_array(case_number) FROM case_numbers WHERE case_id = c.id),
+                (SELECT json_group_array(p.name)
+                 FROM case_judges t JOIN people p ON p.id = t.person_id WHERE t.case_id = c.id),
+                (SELECT json_group_array(json_object('name', p.name, 'role', t.role))
+                 FROM case_litigants t JOIN people p ON p.id = t.person_id WHERE t.case_id = c.id),
+                (SELECT json_group_array(p.name)
+                 FROM case_attorneys t JOIN people p ON p.id = t.person_id WHERE t.case_id = c.id)
+            FROM snapshot_cases s JOIN cases c ON c.id = s.case_id
+            WHERE s.division = ? AND s.year = ?
+            ORDER BY c.id;
+        """,
+        ("case_numbers", "judges", "litigants", "attorneys"),
+    ),
+}
+
+def partition_dir(out: str, table: str, division: str, year: str) -> str:
+    return os.path.join(out, table, f"division={division}", f"year={year}")
+
+def write_partition(conn, out: str, table: str, division: str, year: str, fmt: str, batch_rows: int) -> int:
+    """
+        Streams one table's rows for one partition into record batches and writes them to
+        part-0.<ext> in the partition's directory. The file is written under a temporary name and moved
+        into place, so readers never see half a partition.
+
+        Output: number of rows written
+    """
+    schema, sql, json_columns = TABLES[table]
+    json_indexes = [schema.get_field_index(name) for name in json_columns]
+    directory = partition_dir(out, table, division, year)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"part-0.{FORMATS[fmt]}")
+    tmp_path = path + ".tmp"
+
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(tmp_path, schema, compression="zstd")
+        sink = None
+    else:
+        sink = pa.OSFile(tmp_path, "wb")
+        writer = pa.ipc.new_file(sink, schema)
+
+    cur = conn.cursor()
+    cur.arraysize = batch_rows
+    cur.execute(sql, (division, year))
+    rows_written = 0
+    try:
+        while rows := cur.fetchmany():
+            columns = [list(column) for column in zip(*rows)]
+            for i in json_indexes:
+                columns[i] = [json.loads(value) for value in columns[i]]
+            batch = pa.RecordBatch.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)], schema=schema
+            )
+            writer.write_batch(batch)
+            rows_written += len(rows)
+    finally:
+        writer.close()
+        if sink is not None:
+            sink.close()
+    os.replace(tmp_path, path)
+    return rows_written
+
+def load_state(out: str) -> dict | None:
+    try:
+        with open(os.path.join(out, STATE_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_state(out: str, state: dict) -> None:
+    path = os.path.join(out, STATE_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+def clear_state(out: str) -> None:
+    """
+        Forgets the last export. Called before touching any partition, so a run that dies halfway leaves no
+        state vouching for partitions that aren't on disk, and the next --incremental run does a full export.
+    """
+    try:
+        os.remove(os.path.join(out, STATE_FILE))
+    except FileNotFoundError:
+        pass
+
+def export_snapshot(out: str, fmt: str, incremental: bool, batch_rows: int = DEFAULT_BATCH_ROWS) -> None:
+    conn = db_ops.get_connection()
+    start = time.perf_counter()
+    # One read transaction, so every table comes from the same state of the database even if a scraper
+    # is writing meanwhile
+    conn.execute("BEGIN;")
+    try:
+        conn.execute("DROP TABLE IF EXISTS temp.snapshot_cases;")
+        conn.execute(SNAPSHOT_CASES_SQL)
+        conn.execute("CREATE INDEX temp.idx_snapshot_cases_partition ON snapshot_cases(division, year);")
+        # Each partition's case count and newest scraped_at. A partition needs rewriting when either
+        # changed: a case was written or got its opinion (scraped_at moves forward), or cases were added
+        # or removed.
+        partitions = {
+            (division, year): [count, newest]
+            for division, year, count, newest in conn.execute("""
+                SELECT division, year, COUNT(*), MAX(scraped_at)
+                FROM snapshot_cases
+                GROUP BY division, year;
+            """)
+        }
+
+        state = load_state(out) if incremental else None
+        if incremental and state is None:
+            print("ℹ️ No previous snapshot to update, doing a full export")
+        elif state is not None and state.get("format") != fmt:
+            print(f"ℹ️ Last snapshot was written as {state.get('format')}, doing a full export")
+            state = None
+
+        # save_state puts it back once every partition is written
+        clear_state(out)
+        if state is None:
+            for table in TABLES:
+                shutil.rmtree(os.path.join(out, table), ignore_errors=True)
+            changed = set(partitions)
+        else:
+            previous = {(division, year): [count, newest] for division, year, count, newest in state["partitions"]}
+            changed = {key for key, fingerprint in partitions.items() if previous.get(key) != fingerprint}
+            # Partitions whose cases are all gone
+            for division, year in previous.keys() - partitions.keys():
+                for table in TABLES:
+                    directory = partition_dir(out, table, division, year)
+                    shutil.rmtree(directory, ignore_errors=True)
+                    try:
+                        os.rmdir(os.path.dirname(directory))  # the division's, if that was its last year
+                    except OSError:
+                        pass
+
+        rows = 0
+        for division, year in sorted(changed):
+            for table in TABLES:
+                rows += write_partition(conn, out, table, division, year, fmt, batch_rows)
+    finally:
+        # Ends the read transaction and takes the temp table with it
+        conn.rollback()
+
+    save_state(out, {
+        "format": fmt,
+        "exported_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "partitions": [[division, year, count, newest] for (division, year), (count, newest) in sorted(partitions.items())],
+    })
+    elapsed = time.perf_counter() - start
+    print(
+        f"✅ Wrote {len(changed)} of {len(partitions)} partitions ({rows} rows across {len(TABLES)} tables) "
+        f"to {out} in {elapsed:.1f} s"
+    )
+
+def positive_int(value: str) -> int:
+    """argparse type for counts and widths that have to be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{value!r} is not a whole number")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value} must be at least 1")
+    return number
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export cases.db to Arrow IPC or Parquet files partitioned by division and year."
+    )
+    parser.add_argument("--db", default=db_ops.DB_PATH, help="Database to export (default data/cases.db).")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="Output directory (default data/snapshot).")
+    parser.add_argument(
+        "--format", choices=list(FORMATS), default="arrow",
+        help="arrow (uncompressed Arrow IPC, memory-mappable; default) or parquet (zstd-compressed)."
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="Only rewrite the partitions whose cases changed since the last export to --out."
+    )
+    parser.add_argument(
+        "--batch-rows", type=positive_int, default=DEFAULT_BATCH_ROWS,
+        help=f"Rows per record batch (default {DEFAULT_BATCH_ROWS})."
+    )
+    args = parser.parse_args()
+
+    db_ops.DB_PATH = args.db
+    os.makedirs(args.out, exist_ok=True)
+    export_snapshot(args.out, args.format, args.incremental, args.batch_rows)
+
+if __name__ == "__main__":
+    main()